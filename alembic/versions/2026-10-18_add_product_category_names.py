@@ -0,0 +1,131 @@
+"""add_product_category_names
+
+Revision ID: 7e1b5fa09c62
+Revises: 2d7a94be0f13
+Create Date: 2026-10-18 12:41:09.663851
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "7e1b5fa09c62"
+down_revision = "2d7a94be0f13"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "product",
+        sa.Column(
+            "category_names",
+            sa.ARRAY(sa.String()),
+            server_default="{}",
+            nullable=False,
+        ),
+    )
+    op.execute(
+        """
+        UPDATE product
+        SET category_names = names.category_names
+        FROM (
+            SELECT
+                product_category.product_id,
+                array_agg(category.name ORDER BY category.name) AS category_names
+            FROM product_category
+            JOIN category ON category.id = product_category.category_id
+            GROUP BY product_category.product_id
+        ) AS names
+        WHERE product.id = names.product_id
+        """
+    )
+    op.create_index(
+        "product_category_names_idx",
+        "product",
+        ["category_names"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION refresh_product_category_names(product_ids bigint[])
+        RETURNS void AS $$
+            UPDATE product
+            SET
+                category_names = coalesce(
+                    (
+                        SELECT array_agg(category.name ORDER BY category.name)
+                        FROM product_category
+                        JOIN category ON category.id = product_category.category_id
+                        WHERE product_category.product_id = product.id
+                    ),
+                    '{}'
+                ),
+                updated_at = now()
+            WHERE product.id = ANY(product_ids)
+        $$ LANGUAGE sql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION product_category_sync_category_names()
+        RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM refresh_product_category_names(ARRAY[OLD.product_id]);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM refresh_product_category_names(ARRAY[NEW.product_id]);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER product_category_sync_category_names
+        AFTER INSERT OR UPDATE OR DELETE ON product_category
+        FOR EACH ROW EXECUTE FUNCTION product_category_sync_category_names()
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION category_sync_category_names()
+        RETURNS trigger AS $$
+        BEGIN
+            PERFORM refresh_product_category_names(
+                ARRAY(
+                    SELECT product_id FROM product_category
+                    WHERE category_id = NEW.id
+                )
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER category_sync_category_names
+        AFTER UPDATE OF name ON category
+        FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+        EXECUTE FUNCTION category_sync_category_names()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS category_sync_category_names ON category")
+    op.execute(
+        "DROP TRIGGER IF EXISTS product_category_sync_category_names "
+        "ON product_category"
+    )
+    op.execute("DROP FUNCTION IF EXISTS category_sync_category_names()")
+    op.execute("DROP FUNCTION IF EXISTS product_category_sync_category_names()")
+    op.execute("DROP FUNCTION IF EXISTS refresh_product_category_names(bigint[])")
+    op.drop_index("product_category_names_idx", table_name="product")
+    op.drop_column("product", "category_names")
@@ -0,0 +1,56 @@
+"""add_product_filter_indexes
+
+Revision ID: 2d7a94be0f13
+Revises: 9c3f62a1d8e4
+Create Date: 2026-10-18 11:26:52.107334
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "2d7a94be0f13"
+down_revision = "9c3f62a1d8e4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index("product_style_idx", "product", ["style"], unique=False)
+    op.create_index("product_pattern_idx", "product", ["pattern"], unique=False)
+    op.create_index(op.f("category_name_idx"), "category", ["name"], unique=False)
+    op.create_index(
+        "product_style_trgm_idx",
+        "product",
+        ["style"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"style": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "product_pattern_trgm_idx",
+        "product",
+        ["pattern"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"pattern": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "category_name_trgm_idx",
+        "category",
+        ["name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("category_name_trgm_idx", table_name="category")
+    op.drop_index("product_pattern_trgm_idx", table_name="product")
+    op.drop_index("product_style_trgm_idx", table_name="product")
+    op.drop_index(op.f("category_name_idx"), table_name="category")
+    op.drop_index("product_pattern_idx", table_name="product")
+    op.drop_index("product_style_idx", table_name="product")
@@ -0,0 +1,54 @@
+"""add_product_search_vector
+
+Revision ID: 5b0e8d7c41a9
+Revises: e859a2d02c41
+Create Date: 2026-10-18 09:12:40.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "5b0e8d7c41a9"
+down_revision = "e859a2d02c41"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("CREATE TEXT SEARCH CONFIGURATION vn_unaccent (COPY = simple)")
+    op.execute(
+        "ALTER TEXT SEARCH CONFIGURATION vn_unaccent "
+        "ALTER MAPPING FOR hword, hword_part, word WITH unaccent, simple"
+    )
+    op.add_column(
+        "product",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('vn_unaccent', coalesce(name, '')), 'A') || "
+                "setweight(to_tsvector('vn_unaccent', coalesce(brand, '')), 'B') || "
+                "setweight(to_tsvector('vn_unaccent', coalesce(style, '')), 'C') || "
+                "setweight(to_tsvector('vn_unaccent', coalesce(pattern, '')), 'C') || "
+                "setweight(to_tsvector('vn_unaccent', coalesce(description, '')), 'D')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "product_search_vector_idx",
+        "product",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("product_search_vector_idx", table_name="product")
+    op.drop_column("product", "search_vector")
+    op.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS vn_unaccent")
@@ -0,0 +1,46 @@
+"""hash_refresh_tokens
+
+Revision ID: 5d0b7f3e9a21
+Revises: c2e95a4f7d16
+Create Date: 2026-10-18 21:12:37.604518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "5d0b7f3e9a21"
+down_revision = "c2e95a4f7d16"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "refresh_token", sa.Column("token_digest", sa.String(length=64), nullable=True)
+    )
+    op.execute(
+        "UPDATE refresh_token "
+        "SET token_digest = encode(sha256(convert_to(token, 'UTF8')), 'hex')"
+    )
+    op.alter_column("refresh_token", "token_digest", nullable=False)
+    op.create_index(
+        op.f("refresh_token_token_digest_idx"),
+        "refresh_token",
+        ["token_digest"],
+        unique=True,
+    )
+    op.drop_column("refresh_token", "token")
+
+
+def downgrade() -> None:
+    # Digests can't be turned back into tokens, every session has to sign in again
+    op.add_column(
+        "refresh_token",
+        sa.Column("token", sa.VARCHAR(), autoincrement=False, nullable=True),
+    )
+    op.execute("UPDATE refresh_token SET token = token_digest, expires_at = now()")
+    op.alter_column("refresh_token", "token", nullable=False)
+    op.drop_index(op.f("refresh_token_token_digest_idx"), table_name="refresh_token")
+    op.drop_column("refresh_token", "token_digest")
@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, status
 
 from src.admin.dependencies import get_admin_service, valid_admin_jwt_token
 from src.admin.schemas import AdminUserData
 from src.admin.service import AdminService
 from src.auth.schemas import JWTData
+from src.product.dependencies import get_product_service
+from src.product.service import ProductService
+from src.recommendation.client import recommendation_client
+from src.recommendation.schemas import CircuitBreakerMetrics
 from src.user.constants import SubscriptionType
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
@@ -24,3 +28,22 @@ async def get_users(
         is_active=is_active,
         is_activated=is_activated,
     )
+
+
+@router.get("/recommendation/metrics")
+async def get_recommendation_metrics(
+    jwt_data: JWTData = Depends(valid_admin_jwt_token),
+) -> list[CircuitBreakerMetrics]:
+    return [
+        breaker.get_metrics() for breaker in recommendation_client.breakers.values()
+    ]
+
+
+@router.post(
+    "/products/filter-options/invalidate", status_code=status.HTTP_204_NO_CONTENT
+)
+async def invalidate_product_filter_options(
+    jwt_data: JWTData = Depends(valid_admin_jwt_token),
+    product_service: ProductService = Depends(get_product_service),
+) -> None:
+    product_service.invalidate_filter_options()
@@ -1,11 +1,16 @@
 from pydantic import BaseSettings
 
+from src.auth.constants import JWTBackendType
+
 
 class Settings(BaseSettings):
     JWT_ALG: str
     JWT_SECRET: str
     JWT_EXPIRES_SECONDS: int
     JWT_EXTRA_SECRET: str
+    JWT_BACKEND: JWTBackendType = JWTBackendType.JOSE
+    JWT_CLAIMS_CACHE_MAXSIZE: int = 10_000
+    JWT_CLAIMS_CACHE_TTL_SECONDS: float = 5 * 60
 
     SITE_DOMAIN: str
 
@@ -14,8 +19,9 @@ class Settings(BaseSettings):
 
     SECURE_COOKIES: bool = True
 
-    SENDER_EMAIL: str
-    SENDER_EMAIL_PASSWORD: str
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASHING_WORKERS: int = 4
+    PASSWORD_HASHING_MAX_PENDING: int = 64
 
 
 settings = Settings()
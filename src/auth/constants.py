@@ -23,6 +23,9 @@ class ErrorMessage:
         "Your account has not been activated! Please activate and try again!"
     )
     ACCOUNT_ALREADY_ACTIVATED = "Your account has already been activated!"
+    PASSWORD_HASHING_OVERLOADED = (
+        "Too many sign-in requests at the moment. Please try again shortly!"
+    )
 
 
 class SuccessMessage:
@@ -49,3 +52,8 @@ class UserRole(str, Enum):
     ADMIN = "ADMIN"
     SUBSCRIBER = "SUBSCRIBER"
     USER = "USER"
+
+
+class JWTBackendType(str, Enum):
+    JOSE = "JOSE"
+    HMAC = "HMAC"
@@ -1,8 +1,6 @@
 from fastapi import Body, Cookie, Depends
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
 
-from src.auth.config import settings
 from src.auth.constants import AuthMethod
 from src.auth.exceptions import (
     AuthRequired,
@@ -11,6 +9,7 @@ from src.auth.exceptions import (
     InvalidToken,
     RefreshTokenNotValid,
 )
+from src.auth.jwt import decode_access_token
 from src.auth.repository import AuthRepo
 from src.auth.schemas import AuthData, JWTData, RefreshTokenData
 from src.auth.service import AuthService
@@ -42,12 +41,7 @@ async def valid_jwt_token_optional(
     if not token:
         return None
 
-    try:
-        payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALG])
-    except JWTError:
-        raise InvalidToken()
-
-    return JWTData(**payload)
+    return decode_access_token(token)
 
 
 async def valid_jwt_token(
@@ -1,5 +1,10 @@
 from src.auth.constants import ErrorMessage
-from src.exceptions import BadRequest, NotAuthenticated, PermissionDenied
+from src.exceptions import (
+    BadRequest,
+    NotAuthenticated,
+    PermissionDenied,
+    TooManyRequests,
+)
 
 
 class AuthRequired(NotAuthenticated):
@@ -48,3 +53,10 @@ class AccountNotActivated(PermissionDenied):
 
 class AccountAlreadyActivated(BadRequest):
     DETAIL = ErrorMessage.ACCOUNT_ALREADY_ACTIVATED
+
+
+class PasswordHashingOverloaded(TooManyRequests):
+    DETAIL = ErrorMessage.PASSWORD_HASHING_OVERLOADED
+
+    def __init__(self) -> None:
+        super().__init__(headers={"Retry-After": "1"})
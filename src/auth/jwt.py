@@ -1,12 +1,128 @@
+import base64
+import hashlib
+import hmac
+import time
+from abc import ABC, abstractmethod
+from calendar import timegm
 from datetime import datetime, timedelta
+from typing import Any
 
+import orjson
 from jose import JWTError, jwt
 
 from src.auth.config import settings
+from src.auth.constants import JWTBackendType
 from src.auth.exceptions import InvalidToken
+from src.auth.schemas import JWTData
+from src.cache import TTLCache
 from src.user.schemas import UserData
 
 
+class JWTBackend(ABC):
+    @abstractmethod
+    def encode(self, claims: dict[str, Any], key: str, algorithm: str) -> str:
+        ...
+
+    @abstractmethod
+    def decode(self, token: str, key: str, algorithms: list[str]) -> dict[str, Any]:
+        """
+        Raises InvalidToken if the signature, algorithm or expiration is invalid.
+        """
+
+
+class JoseJWTBackend(JWTBackend):
+    def encode(self, claims: dict[str, Any], key: str, algorithm: str) -> str:
+        return jwt.encode(claims=claims, key=key, algorithm=algorithm)
+
+    def decode(self, token: str, key: str, algorithms: list[str]) -> dict[str, Any]:
+        try:
+            return jwt.decode(token=token, key=key, algorithms=algorithms)
+        except JWTError:
+            raise InvalidToken()
+
+
+class HMACJWTBackend(JWTBackend):
+    """
+    Minimal HS256/HS384/HS512 implementation on top of the standard library, which
+    skips the generic key handling and claim checks done by python-jose.
+    """
+
+    DIGESTS = {
+        "HS256": hashlib.sha256,
+        "HS384": hashlib.sha384,
+        "HS512": hashlib.sha512,
+    }
+
+    def encode(self, claims: dict[str, Any], key: str, algorithm: str) -> str:
+        claims = {
+            name: timegm(value.utctimetuple()) if isinstance(value, datetime) else value
+            for name, value in claims.items()
+        }
+        signing_input = b".".join(
+            (
+                self._b64encode(orjson.dumps({"alg": algorithm, "typ": "JWT"})),
+                self._b64encode(orjson.dumps(claims)),
+            )
+        )
+        signature = self._sign(signing_input, key, algorithm)
+        return b".".join((signing_input, self._b64encode(signature))).decode()
+
+    def decode(self, token: str, key: str, algorithms: list[str]) -> dict[str, Any]:
+        try:
+            signing_input, _, encoded_signature = token.encode().rpartition(b".")
+            encoded_header, _, encoded_claims = signing_input.partition(b".")
+            header = orjson.loads(self._b64decode(encoded_header))
+            algorithm = header.get("alg")
+            if algorithm not in algorithms or algorithm not in self.DIGESTS:
+                raise InvalidToken()
+
+            signature = self._sign(signing_input, key, algorithm)
+            if not hmac.compare_digest(signature, self._b64decode(encoded_signature)):
+                raise InvalidToken()
+
+            claims = orjson.loads(self._b64decode(encoded_claims))
+            if not isinstance(claims, dict):
+                raise InvalidToken()
+
+            now = time.time()
+            if "exp" in claims and float(claims["exp"]) <= now:
+                raise InvalidToken()
+            if "nbf" in claims and float(claims["nbf"]) > now:
+                raise InvalidToken()
+        except (ValueError, TypeError, AttributeError, OverflowError):
+            raise InvalidToken()
+
+        return claims
+
+    def _sign(self, signing_input: bytes, key: str, algorithm: str) -> bytes:
+        return hmac.new(key.encode(), signing_input, self.DIGESTS[algorithm]).digest()
+
+    @staticmethod
+    def _b64encode(value: bytes) -> bytes:
+        return base64.urlsafe_b64encode(value).rstrip(b"=")
+
+    @staticmethod
+    def _b64decode(value: bytes) -> bytes:
+        return base64.urlsafe_b64decode(value + b"=" * (-len(value) % 4))
+
+
+def get_jwt_backend(backend_type: JWTBackendType = settings.JWT_BACKEND) -> JWTBackend:
+    if (
+        backend_type == JWTBackendType.HMAC
+        and settings.JWT_ALG in HMACJWTBackend.DIGESTS
+    ):
+        return HMACJWTBackend()
+    return JoseJWTBackend()
+
+
+jwt_backend = get_jwt_backend()
+
+_claims_cache: TTLCache[bytes, JWTData] = TTLCache(
+    maxsize=settings.JWT_CLAIMS_CACHE_MAXSIZE,
+    ttl=settings.JWT_CLAIMS_CACHE_TTL_SECONDS,
+)
+
+
 def create_access_token(
     user: UserData,
     expires_delta: timedelta = timedelta(seconds=settings.JWT_EXPIRES_SECONDS),
@@ -20,7 +136,9 @@ def create_access_token(
         "is_active": user.is_active,
         "is_activated": user.is_activated,
     }
-    return jwt.encode(claims=jwt_data, key=secret_key, algorithm=settings.JWT_ALG)
+    return jwt_backend.encode(
+        claims=jwt_data, key=secret_key, algorithm=settings.JWT_ALG
+    )
 
 
 def decode_token(
@@ -28,8 +146,28 @@ def decode_token(
     secret_key: str = settings.JWT_SECRET,
     algorithms: list[str] | str = [settings.JWT_ALG],
 ) -> dict:
-    try:
-        payload = jwt.decode(token=token, key=secret_key, algorithms=algorithms)
-        return payload
-    except JWTError:
-        raise InvalidToken()
+    if isinstance(algorithms, str):
+        algorithms = [algorithms]
+    return jwt_backend.decode(token=token, key=secret_key, algorithms=algorithms)
+
+
+def decode_access_token(token: str) -> JWTData:
+    """
+    Verified claims are cached by token digest until the token expires, so a token
+    sent repeatedly is only verified once.
+    """
+    token_digest = hashlib.sha256(token.encode()).digest()
+    jwt_data = _claims_cache.get(token_digest)
+    if jwt_data:
+        return jwt_data
+
+    payload = decode_token(token)
+    jwt_data = JWTData(**payload)
+    expires_in = float(payload.get("exp", 0)) - time.time()
+    if expires_in > 0:
+        _claims_cache.set(
+            token_digest,
+            jwt_data,
+            ttl=min(expires_in, settings.JWT_CLAIMS_CACHE_TTL_SECONDS),
+        )
+    return jwt_data
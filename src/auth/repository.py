@@ -1,6 +1,10 @@
+import hmac
 from uuid import UUID
 
+from sqlalchemy import func
+
 from src.auth.schemas import RefreshTokenCreate, RefreshTokenData, RefreshTokenUpdate
+from src.auth.security import hash_refresh_token
 from src.auth.table import refresh_token_tb
 from src.database import database
 
@@ -18,11 +22,14 @@ class AuthRepo:
         return RefreshTokenData(**result._mapping)  # type: ignore
 
     async def get_refresh_token(self, refresh_token: str) -> RefreshTokenData | None:
+        token_digest = hash_refresh_token(refresh_token)
         select_query = refresh_token_tb.select().where(
-            refresh_token_tb.c.token == refresh_token
+            refresh_token_tb.c.token_digest == token_digest
         )
         result = await database.fetch_one(select_query)
-        return RefreshTokenData(**result._mapping) if result else None
+        if not result or not hmac.compare_digest(result.token_digest, token_digest):
+            return None
+        return RefreshTokenData(**result._mapping)
 
     async def update_refresh_token(
         self, user_id: UUID, update_data: RefreshTokenUpdate
@@ -35,3 +42,20 @@ class AuthRepo:
         )
         result = await database.fetch_one(update_query)
         return RefreshTokenData(**result._mapping)  # type: ignore
+
+    async def rotate_refresh_token(
+        self, token_digest: str, update_data: RefreshTokenUpdate
+    ) -> RefreshTokenData | None:
+        # Keyed by the old digest so a token can only be rotated once, a concurrent
+        # request replaying the same token matches no row
+        update_query = (
+            refresh_token_tb.update()
+            .values(update_data.dict(exclude_unset=True))
+            .where(
+                refresh_token_tb.c.token_digest == token_digest,
+                refresh_token_tb.c.expires_at >= func.now(),
+            )
+            .returning(refresh_token_tb)
+        )
+        result = await database.fetch_one(update_query)
+        return RefreshTokenData(**result._mapping) if result else None
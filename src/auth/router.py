@@ -1,4 +1,4 @@
-from fastapi import APIRouter, BackgroundTasks, Body, Depends, Response, status
+from fastapi import APIRouter, Body, Depends, Response, status
 
 from src.auth import jwt, utils
 from src.auth.constants import SuccessMessage
@@ -30,27 +30,25 @@ router = APIRouter(prefix="/auth", tags=["Auth"])
 
 @router.post("/users", status_code=status.HTTP_201_CREATED)
 async def register_user(
-    background_tasks: BackgroundTasks,
     user_create: UserCreate = Depends(valid_user_create),
     service: AuthService = Depends(get_auth_service),
     user_service: UserService = Depends(get_user_service),
 ) -> Message:
     user = await user_service.create_user(user_create)
     await service.create_refresh_token(user_id=user.id)
-    background_tasks.add_task(service.create_and_send_activate_email, user=user)
+    await service.create_and_send_activate_email(user=user)
     return Message(detail=SuccessMessage.SUCCESS_ACCOUNT_CREATED)
 
 
 @router.post("/users/activate/request")
 async def request_activate_account(
-    background_tasks: BackgroundTasks,
     user: UserData = Depends(valid_user_email),
     service: AuthService = Depends(get_auth_service),
 ) -> Message:
     if user.is_activated:
         raise AccountAlreadyActivated()
 
-    background_tasks.add_task(service.create_and_send_activate_email, user=user)
+    await service.create_and_send_activate_email(user=user)
     return Message(detail=SuccessMessage.SUCCESS_REQUEST_ACTIVATE_ACCOUNT)
 
 
@@ -65,11 +63,10 @@ async def activate_account(
 
 @router.post("/users/forgot-password")
 async def forgot_password(
-    background_tasks: BackgroundTasks,
     user: UserData = Depends(valid_user_email),
     service: AuthService = Depends(get_auth_service),
 ) -> Message:
-    background_tasks.add_task(service.create_and_send_reset_password_email, user=user)
+    await service.create_and_send_reset_password_email(user=user)
     return Message(detail=SuccessMessage.SUCCESS_REQUEST_RESET_PASSWORD)
 
 
@@ -123,7 +120,9 @@ async def refresh_tokens(
     user: UserData = Depends(valid_refresh_token_user),
     service: AuthService = Depends(get_auth_service),
 ) -> TokenData:
-    refresh_token = await service.issue_new_refresh_token(user_id=refresh_token.user_id)
+    refresh_token = await service.issue_new_refresh_token(
+        user_id=refresh_token.user_id, token_digest=refresh_token.token_digest
+    )
     response.set_cookie(**utils.get_refresh_token_settings(refresh_token.token))
 
     return TokenData(
@@ -140,9 +139,7 @@ async def logout_user(
 ) -> None:
     await service.expire_refresh_token(user_id=refresh_token.user_id)
     response.set_cookie(
-        **utils.get_refresh_token_settings(
-            refresh_token=refresh_token.token, has_expired=True
-        )
+        **utils.get_refresh_token_settings(refresh_token="", has_expired=True)
     )
 
 
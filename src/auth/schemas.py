@@ -28,7 +28,9 @@ class JWTData(BaseModel):
 class RefreshTokenData(BaseModel):
     id: UUID
     user_id: UUID
-    token: str
+    token_digest: str
+    # Only the digest is stored, the plaintext is set right after issuing
+    token: str | None = None
     expires_at: datetime
     created_at: datetime | None
     updated_at: datetime | None
@@ -50,10 +52,10 @@ class UserResetPassword(BaseModel):
 
 class RefreshTokenCreate(BaseModel):
     user_id: UUID = Field(default=None, hidden=True)
-    token: str
+    token_digest: str
     expires_at: datetime
 
 
 class RefreshTokenUpdate(BaseModel):
-    token: str | None
+    token_digest: str | None
     expires_at: datetime | None
@@ -1,15 +1,43 @@
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
 import bcrypt
-from fastapi.concurrency import run_in_threadpool
+
+from src.auth.config import settings
+from src.auth.exceptions import PasswordHashingOverloaded
+
+T = TypeVar("T")
+
+# bcrypt releases the GIL, so a small dedicated thread pool keeps hashing bursts
+# from starving the default pool shared with every other sync call
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASHING_WORKERS, thread_name_prefix="bcrypt"
+)
+_pending_tasks = 0
+
+
+async def _run_in_executor(func: Callable[..., T], *args) -> T:
+    global _pending_tasks
+    if _pending_tasks >= settings.PASSWORD_HASHING_MAX_PENDING:
+        raise PasswordHashingOverloaded()
+
+    _pending_tasks += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+    finally:
+        _pending_tasks -= 1
 
 
 def _hash_password_sync(password: str) -> bytes:
     pw = bytes(password, "utf-8")
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     return bcrypt.hashpw(pw, salt)
 
 
 async def hash_password(password: str) -> bytes:
-    return await run_in_threadpool(_hash_password_sync, password)
+    return await _run_in_executor(_hash_password_sync, password)
 
 
 def _check_password_sync(password: str, hashed_password: bytes) -> bool:
@@ -18,4 +46,26 @@ def _check_password_sync(password: str, hashed_password: bytes) -> bool:
 
 
 async def check_password(password: str, hashed_password: bytes) -> bool:
-    return await run_in_threadpool(_check_password_sync, password, hashed_password)
+    return await _run_in_executor(_check_password_sync, password, hashed_password)
+
+
+def needs_rehash(hashed_password: bytes) -> bool:
+    """
+    Tells whether the hash was made with a cost factor other than BCRYPT_ROUNDS.
+    """
+    try:
+        rounds = int(hashed_password.split(b"$")[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds != settings.BCRYPT_ROUNDS
+
+
+def shutdown_password_hasher() -> None:
+    _executor.shutdown(wait=True, cancel_futures=True)
+
+
+def hash_refresh_token(refresh_token: str) -> str:
+    """
+    Refresh tokens are long random strings, so a plain SHA-256 is enough here.
+    """
+    return hashlib.sha256(refresh_token.encode()).hexdigest()
@@ -16,6 +16,8 @@ from src.auth.exceptions import (
     AccountSuspended,
     InvalidCredentials,
     InvalidToken,
+    PasswordHashingOverloaded,
+    RefreshTokenNotValid,
 )
 from src.auth.repository import AuthRepo
 from src.auth.schemas import (
@@ -25,7 +27,7 @@ from src.auth.schemas import (
     RefreshTokenUpdate,
     UserResetPassword,
 )
-from src.auth.security import check_password
+from src.auth.security import check_password, hash_refresh_token, needs_rehash
 from src.auth.utils import send_activate_email, send_reset_password_email
 from src.aws.client import S3
 from src.aws.schemas import PresignedUrlData
@@ -53,6 +55,15 @@ class AuthService:
 
         if not user.is_activated:
             raise AccountNotActivated()
+
+        # The rehash is best-effort, the user already proved their password
+        if needs_rehash(user.password):  # type: ignore
+            try:
+                user = await self.user_repo.update_user(
+                    id=user.id, update_data={"password": auth_data.password}
+                )
+            except PasswordHashingOverloaded:
+                logger.warning(f"Skipped rehashing the password of user {user.id}")
         return user
 
     async def authenticate_user_signed_in_via_google(self, id_token: str) -> UserData:
@@ -85,23 +96,46 @@ class AuthService:
         return user
 
     async def create_refresh_token(self, user_id: UUID) -> RefreshTokenData:
+        token = utils.generate_random_alphanum(64)
         create_data = RefreshTokenCreate(
             user_id=user_id,
-            token=utils.generate_random_alphanum(64),
+            token_digest=hash_refresh_token(token),
             expires_at=utc_now()
             + timedelta(seconds=settings.REFRESH_TOKEN_EXPIRES_SECONDS),
         )
-        return await self.auth_repo.create_refresh_token(create_data=create_data)
-
-    async def issue_new_refresh_token(self, user_id: UUID) -> RefreshTokenData:
+        refresh_token = await self.auth_repo.create_refresh_token(
+            create_data=create_data
+        )
+        refresh_token.token = token
+        return refresh_token
+
+    async def issue_new_refresh_token(
+        self, user_id: UUID, token_digest: str | None = None
+    ) -> RefreshTokenData:
+        """
+        Rotates the refresh token of the user, or only the one matching token_digest
+        when given, so that a refresh token can't be used twice.
+        """
+        token = utils.generate_random_alphanum(64)
         update_data = RefreshTokenUpdate(
-            token=utils.generate_random_alphanum(64),
+            token_digest=hash_refresh_token(token),
             expires_at=utc_now()
             + timedelta(seconds=settings.REFRESH_TOKEN_EXPIRES_SECONDS),
         )
-        return await self.auth_repo.update_refresh_token(
-            user_id=user_id, update_data=update_data
-        )
+        if token_digest is None:
+            refresh_token = await self.auth_repo.update_refresh_token(
+                user_id=user_id, update_data=update_data
+            )
+        else:
+            rotated = await self.auth_repo.rotate_refresh_token(
+                token_digest=token_digest, update_data=update_data
+            )
+            if not rotated:
+                raise RefreshTokenNotValid()
+            refresh_token = rotated
+
+        refresh_token.token = token
+        return refresh_token
 
     async def expire_refresh_token(self, user_id: UUID):
         update_data = RefreshTokenUpdate(
@@ -111,7 +145,7 @@ class AuthService:
             user_id=user_id, update_data=update_data
         )
 
-    def create_and_send_activate_email(self, user: UserData) -> None:
+    async def create_and_send_activate_email(self, user: UserData) -> None:
         username = user.full_name or user.email.split("@")[0]
         token = jwt.create_access_token(
             user=user,
@@ -119,13 +153,13 @@ class AuthService:
             secret_key=settings.JWT_EXTRA_SECRET,
         )
         activate_url = f"{settings.SITE_DOMAIN}/users/activate?token={token}"
-        send_activate_email(
+        await send_activate_email(
             receiver_email=user.email,
             username=username,
             activate_url=activate_url,
         )
 
-    def create_and_send_reset_password_email(self, user: UserData) -> None:
+    async def create_and_send_reset_password_email(self, user: UserData) -> None:
         username = user.full_name or user.email.split("@")[0]
         token = jwt.create_access_token(
             user=user,
@@ -133,7 +167,7 @@ class AuthService:
             secret_key=settings.JWT_EXTRA_SECRET,
         )
         reset_url = f"{settings.SITE_DOMAIN}/users/reset-password?token={token}"
-        send_reset_password_email(
+        await send_reset_password_email(
             receiver_email=user.email,
             username=username,
             reset_url=reset_url,
@@ -19,7 +19,7 @@ refresh_token_tb = Table(
         nullable=False,
         unique=True,
     ),
-    Column("token", String, nullable=False),
+    Column("token_digest", String(64), index=True, nullable=False, unique=True),
     Column("expires_at", DateTime(timezone=True), nullable=False),
     Column(
         "created_at", DateTime(timezone=True), server_default=func.now(), nullable=False
@@ -1,11 +1,11 @@
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+from email.message import EmailMessage
 from typing import Any
 
 from jinja2 import Environment, FileSystemLoader
 
 from src.auth.config import settings
+from src.mail.config import settings as mail_settings
+from src.mail.sender import mail_sender
 
 
 def get_refresh_token_settings(
@@ -24,31 +24,30 @@ def get_refresh_token_settings(
     return base_cookies
 
 
-def send_email(
+_templates = Environment(loader=FileSystemLoader("src/auth/templates"), autoescape=True)
+
+
+async def send_email(
     template_name: str, receiver_email: str, subject: str, render_data: dict[str, str]
 ) -> None:
-    env = Environment(loader=FileSystemLoader("src/auth/templates"), autoescape=True)
-    template = env.get_template(template_name)
+    template = _templates.get_template(template_name)
     html_content = template.render(render_data)
 
-    msg = MIMEMultipart()
-    msg["From"] = settings.SENDER_EMAIL
+    msg = EmailMessage()
+    msg["From"] = mail_settings.SENDER_EMAIL
     msg["To"] = receiver_email
     msg["Subject"] = subject
-    msg.attach(MIMEText(html_content, "html"))
+    msg.set_content(html_content, subtype="html")
 
-    # Create SMTP session for sending the mail
-    server = smtplib.SMTP("smtp.gmail.com", 587)
-    server.starttls()
-    server.login(user=settings.SENDER_EMAIL, password=settings.SENDER_EMAIL_PASSWORD)
-    server.sendmail(settings.SENDER_EMAIL, receiver_email, msg.as_string())
-    server.quit()
+    await mail_sender.submit(msg)
 
 
-def send_activate_email(receiver_email: str, username: str, activate_url: str) -> None:
+async def send_activate_email(
+    receiver_email: str, username: str, activate_url: str
+) -> None:
     TEMPLATE_NAME = "activate_account.html"
     SUBJECT = "Activate Your Account!"
-    send_email(
+    await send_email(
         template_name=TEMPLATE_NAME,
         receiver_email=receiver_email,
         subject=SUBJECT,
@@ -56,12 +55,12 @@ def send_activate_email(receiver_email: str, username: str, activate_url: str) -
     )
 
 
-def send_reset_password_email(
+async def send_reset_password_email(
     receiver_email: str, username: str, reset_url: str
 ) -> None:
     TEMPLATE_NAME = "reset_password.html"
     SUBJECT = "Reset your password!"
-    send_email(
+    await send_email(
         template_name=TEMPLATE_NAME,
         receiver_email=receiver_email,
         subject=SUBJECT,
@@ -0,0 +1,37 @@
+from enum import Enum
+
+
+class ClosetResponseMode(str, Enum):
+    FULL = "FULL"
+    DELTA = "DELTA"
+
+
+class ClosetItemStatus(str, Enum):
+    ADDED = "ADDED"
+    ALREADY_IN_CLOSET = "ALREADY_IN_CLOSET"
+    NOT_FOUND = "NOT_FOUND"
+    REMOVED = "REMOVED"
+    NOT_IN_CLOSET = "NOT_IN_CLOSET"
+
+
+CLOSET_ITEM_FIELDS = (
+    "id",
+    "owner_id",
+    "name",
+    "description",
+    "categories",
+    "hashtags",
+    "brand",
+    "material",
+    "style",
+    "pattern",
+    "original_url",
+    "transparent_background_image",
+    "is_public",
+    "shopee_affiliate_url",
+    "lazada_affiliate_url",
+    "tiktok_affiliate_url",
+    "image_urls",
+    "created_at",
+    "updated_at",
+)
@@ -2,15 +2,18 @@ from fastapi import Depends
 
 from src.auth.dependencies import valid_jwt_token
 from src.auth.schemas import JWTData
+from src.closet.constants import CLOSET_ITEM_FIELDS
 from src.closet.exceptions import (
     AtLeastOneProductAlreadyInCloset,
     AtLeastOneProductNotInCloset,
+    InvalidClosetItemFields,
     ProductCantBeAddedAndRemoved,
 )
 from src.closet.repository import ClosetRepo
 from src.closet.schemas import ClosetData, ClosetUpdate
 from src.closet.service import ClosetService
 from src.product.repository import ProductRepo
+from src.schemas import to_camel
 
 
 async def get_closet_service(
@@ -45,3 +48,31 @@ async def valid_closet_update(
     if not set(removed_product_ids).issubset(product_ids):
         raise AtLeastOneProductNotInCloset()
     return closet_update
+
+
+async def valid_closet_item_fields(fields: str | None = None) -> list[str]:
+    """
+    Parses a comma separated field projection, e.g. `fields=id,name,image_urls`.
+    Fields may be given in snake or camel case, and `id` is always returned.
+    """
+    if not fields:
+        return list(CLOSET_ITEM_FIELDS)
+
+    field_names = {to_camel(field): field for field in CLOSET_ITEM_FIELDS}
+    requested_fields = ["id"]
+    for field in fields.split(","):
+        field = field_names.get(to_camel(field.strip()))
+        if not field:
+            raise InvalidClosetItemFields()
+        if field not in requested_fields:
+            requested_fields.append(field)
+    return requested_fields
+
+
+async def valid_closet_bulk_update(closet_update: ClosetUpdate) -> ClosetUpdate:
+    if set(closet_update.added_product_ids).intersection(
+        closet_update.removed_product_ids
+    ):
+        raise ProductCantBeAddedAndRemoved()
+
+    return closet_update
@@ -11,3 +11,7 @@ class AtLeastOneProductNotInCloset(BadRequest):
 
 class ProductCantBeAddedAndRemoved(BadRequest):
     DETAIL = "Product can't be both added and removed!"
+
+
+class InvalidClosetItemFields(BadRequest):
+    DETAIL = "At least one of the requested fields doesn't exist on closet items!"
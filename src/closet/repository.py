@@ -1,15 +1,41 @@
+import asyncio
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import delete, func, insert, select
+import orjson
+from sqlalchemy import (
+    BigInteger,
+    and_,
+    case,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
+from sqlalchemy.sql.selectable import CTE
 
-from src.closet.schemas import ClosetCreate, ClosetData
+from src.closet.constants import ClosetItemStatus
+from src.closet.schemas import ClosetCreate, ClosetData, ClosetItemOutcome
 from src.closet.table import closet_item_tb, closet_tb
 from src.database import database
+from src.product.constants import FilterMode
+from src.product.repository import ProductRepo
 from src.product.schemas import ProductData
-from src.product.table import category_tb, product_category_tb, product_tb
+from src.product.table import product_data_columns, product_tb
+from src.repository import invalidates, memoized
+from src.schemas import ResourceVersion, to_camel
 
 
 class ClosetRepo:
+    @invalidates
     async def create(self, create_data: ClosetCreate) -> ClosetData:
         async with database.transaction() as transaction:
             insert_query = (
@@ -23,15 +49,131 @@ class ClosetRepo:
             await transaction.commit()
             return new_closet
 
+    @staticmethod
+    def get_ids_query(name: str, ids: list[int]) -> CTE:
+        """
+        Sends the ids as a single array parameter, however many there are.
+        """
+        return (
+            select(
+                func.unnest(literal(ids, type_=ARRAY(BigInteger))).label("product_id")
+            )
+            .distinct()
+            .cte(name)
+        )
+
+    @invalidates
     async def create_closet_items(self, closet_id: UUID, product_ids: list[int]):
-        insert_query = insert(closet_item_tb).values(
+        added_ids = self.get_ids_query("added_ids", product_ids)
+        insert_query = insert(closet_item_tb).from_select(
+            ["closet_id", "product_id"],
+            select(
+                literal(closet_id, type_=closet_tb.c.id.type), added_ids.c.product_id
+            ),
+        )
+        await database.execute(insert_query)
+
+    @invalidates
+    async def apply_bulk_update(
+        self,
+        closet_id: UUID,
+        owner_id: UUID,
+        added_product_ids: list[int],
+        removed_product_ids: list[int],
+    ) -> tuple[list[ClosetItemOutcome], int | None]:
+        """
+        Adds and removes closet items in one set-based statement and reports the
+        outcome of every given product id, along with the new closet version if
+        anything changed. Only products visible to the owner can be added.
+        """
+        added_ids = self.get_ids_query("added_ids", added_product_ids)
+        removed_ids = self.get_ids_query("removed_ids", removed_product_ids)
+        is_visible = and_(
+            product_tb.c.id == added_ids.c.product_id,
+            or_(product_tb.c.is_public, product_tb.c.owner_id == owner_id),
+        )
+
+        inserted = (
+            postgresql.insert(closet_item_tb)
+            .from_select(
+                ["closet_id", "product_id"],
+                select(
+                    literal(closet_id, type_=closet_tb.c.id.type),
+                    added_ids.c.product_id,
+                ).join(product_tb, onclause=is_visible),
+            )
+            .on_conflict_do_nothing(
+                index_elements=[closet_item_tb.c.closet_id, closet_item_tb.c.product_id]
+            )
+            .returning(closet_item_tb.c.product_id)
+            .cte("inserted")
+        )
+        deleted = (
+            delete(closet_item_tb)
+            .where(closet_item_tb.c.closet_id == closet_id)
+            .where(closet_item_tb.c.product_id.in_(select(removed_ids.c.product_id)))
+            .returning(closet_item_tb.c.product_id)
+            .cte("deleted")
+        )
+        bumped = (
+            update(closet_tb)
+            .where(closet_tb.c.id == closet_id)
+            .where(
+                or_(
+                    exists(select(inserted.c.product_id)),
+                    exists(select(deleted.c.product_id)),
+                )
+            )
+            .values(updated_at=func.now(), version=closet_tb.c.version + 1)
+            .returning(closet_tb.c.version)
+            .cte("bumped")
+        )
+
+        outcomes = union_all(
+            select(
+                added_ids.c.product_id,
+                case(
+                    (
+                        added_ids.c.product_id.in_(select(inserted.c.product_id)),
+                        ClosetItemStatus.ADDED.value,
+                    ),
+                    (
+                        exists(select(product_tb.c.id).where(is_visible)),
+                        ClosetItemStatus.ALREADY_IN_CLOSET.value,
+                    ),
+                    else_=ClosetItemStatus.NOT_FOUND.value,
+                ).label("status"),
+            ),
+            select(
+                removed_ids.c.product_id,
+                case(
+                    (
+                        removed_ids.c.product_id.in_(select(deleted.c.product_id)),
+                        ClosetItemStatus.REMOVED.value,
+                    ),
+                    else_=ClosetItemStatus.NOT_IN_CLOSET.value,
+                ).label("status"),
+            ),
+        ).subquery("outcome")
+        select_query = select(
+            outcomes.c.product_id,
+            outcomes.c.status,
+            select(bumped.c.version).scalar_subquery().label("version"),
+        )
+
+        results = await database.fetch_all(select_query)
+        return (
             [
-                {"closet_id": closet_id, "product_id": product_id}
-                for product_id in product_ids
-            ]
+                ClosetItemOutcome(
+                    product_id=result._mapping["product_id"],
+                    status=result._mapping["status"],
+                )
+                for result in results
+            ],
+            results[0]._mapping["version"] if results else None,
         )
-        await database.fetch_all(insert_query)
 
+    @invalidates
     async def delete_closet_items(self, closet_id: UUID, product_ids: list[int]):
         delete_query = (
             delete(closet_item_tb)
@@ -40,27 +182,204 @@ class ClosetRepo:
         )
         await database.fetch_all(delete_query)
 
+    @memoized
     async def get_by_owner_id(self, owner_id: UUID) -> ClosetData | None:
         select_query = select(closet_tb).where(closet_tb.c.owner_id == owner_id)
         result = await database.fetch_one(select_query)
         return ClosetData(**result._mapping) if result else None
 
-    async def get_closet_items(self, closet_id: UUID) -> list[ProductData]:
+    @staticmethod
+    def get_owner_closet_query(owner_id: UUID) -> CTE:
+        """
+        Inserts the owner's closet unless it already exists and yields it either way.
+        """
+        inserted_closet = (
+            postgresql.insert(closet_tb)
+            .values(owner_id=owner_id)
+            .on_conflict_do_nothing(index_elements=[closet_tb.c.owner_id])
+            .returning(*closet_tb.c)
+            .cte("inserted_closet")
+        )
+        return union_all(
+            select(*inserted_closet.c),
+            select(*closet_tb.c).where(closet_tb.c.owner_id == owner_id),
+        ).cte("owner_closet")
+
+    async def get_or_create(self, owner_id: UUID) -> ClosetData:
+        owner_closet = self.get_owner_closet_query(owner_id)
+        select_query = select(*owner_closet.c)
+        result = await database.fetch_one(select_query)
+        if not result:
+            # A concurrent request created the closet after this statement's
+            # snapshot was taken, it's visible to the next one
+            result = await database.fetch_one(select_query)
+        return ClosetData(**result._mapping)  # type: ignore
+
+    async def get_or_create_with_items(self, owner_id: UUID) -> ClosetData:
+        """
+        Creates the owner's closet if it doesn't exist yet and returns it with its
+        items already split into owned and public products, in a single statement.
+        """
+        owner_closet = self.get_owner_closet_query(owner_id)
+        closet_products = (
+            ProductRepo.get_hydrate_query()
+            .add_columns(
+                closet_item_tb.c.closet_id,
+                closet_item_tb.c.id.label("closet_item_id"),
+            )
+            .join(
+                closet_item_tb, onclause=closet_item_tb.c.product_id == product_tb.c.id
+            )
+            .subquery("closet_product")
+        )
+
+        def aggregate_products(filter_clause):
+            return func.coalesce(
+                func.json_agg(
+                    aggregate_order_by(
+                        closet_products.table_valued(),
+                        closet_products.c.closet_item_id,
+                    )
+                ).filter(filter_clause),
+                literal_column("'[]'::json"),
+            )
+
+        select_query = (
+            select(
+                *owner_closet.c,
+                aggregate_products(
+                    closet_products.c.owner_id == owner_closet.c.owner_id
+                ).label("owned_products"),
+                aggregate_products(
+                    closet_products.c.owner_id != owner_closet.c.owner_id
+                ).label("public_products"),
+            )
+            .select_from(owner_closet)
+            .join(
+                closet_products,
+                isouter=True,
+                onclause=closet_products.c.closet_id == owner_closet.c.id,
+            )
+            .group_by(*owner_closet.c)
+        )
+        result = await database.fetch_one(select_query)
+        if not result:
+            # A concurrent request created the closet after this statement's
+            # snapshot was taken, it's visible to the next one
+            result = await database.fetch_one(select_query)
+
+        closet = dict(result._mapping)  # type: ignore
+        for key in ("owned_products", "public_products"):
+            if isinstance(closet[key], (str, bytes)):
+                closet[key] = orjson.loads(closet[key])
+        return ClosetData(**closet)
+
+    async def get_closet_version(self, owner_id: UUID) -> ResourceVersion | None:
         select_query = (
             select(
+                closet_tb.c.id,
+                closet_tb.c.updated_at,
+                func.count(product_tb.c.id).label("total_items"),
+                func.max(product_tb.c.updated_at).label("items_last_modified"),
+            )
+            .select_from(closet_tb)
+            .join(closet_item_tb, isouter=True)
+            .join(
                 product_tb,
-                func.array_agg(category_tb.c.name).label("categories"),
+                isouter=True,
+                onclause=closet_item_tb.c.product_id == product_tb.c.id,
+            )
+            .where(closet_tb.c.owner_id == owner_id)
+            .group_by(closet_tb.c.id)
+        )
+        result = await database.fetch_one(select_query)
+        if not result:
+            return None
+
+        closet_last_modified = result._mapping["updated_at"]
+        items_last_modified = result._mapping["items_last_modified"]
+        last_modified = (
+            max(closet_last_modified, items_last_modified)
+            if items_last_modified
+            else closet_last_modified
+        )
+        return ResourceVersion.from_validators(
+            last_modified,
+            result._mapping["id"],
+            closet_last_modified,
+            result._mapping["total_items"],
+        )
+
+    @invalidates
+    async def touch(self, closet_id: UUID) -> int:
+        """
+        Marks the closet as modified and returns its new version.
+        """
+        update_query = (
+            update(closet_tb)
+            .where(closet_tb.c.id == closet_id)
+            .values(updated_at=func.now(), version=closet_tb.c.version + 1)
+            .returning(closet_tb.c.version)
+        )
+        return await database.execute(update_query)
+
+    @memoized
+    async def get_closet_items(self, closet_id: UUID) -> list[ProductData]:
+        select_query = (
+            ProductRepo.get_hydrate_query()
+            .join(
+                closet_item_tb, onclause=closet_item_tb.c.product_id == product_tb.c.id
             )
-            .select_from(closet_item_tb)
-            .join(product_tb)
-            .join(product_category_tb, isouter=True)
-            .join(category_tb, isouter=True)
             .where(closet_item_tb.c.closet_id == closet_id)
-            .group_by(product_tb.c.id)
         )
         results = await database.fetch_all(select_query)
         return [ProductData(**result._mapping) for result in results]
 
+    async def get_closet_items_page(
+        self,
+        closet_id: UUID,
+        fields: list[str],
+        categories: list[str] | None = None,
+        styles: list[str] | None = None,
+        offset: int = 0,
+        size: int = 20,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """
+        Only the requested product columns are read, and rows are returned as plain
+        dicts keyed by their camel-cased field name to skip model validation.
+        """
+        columns_by_name = {column.name: column for column in product_data_columns}
+        filter_query = (
+            select(closet_item_tb.c.id)
+            .join(product_tb, onclause=closet_item_tb.c.product_id == product_tb.c.id)
+            .where(closet_item_tb.c.closet_id == closet_id)
+        )
+        if categories:
+            filter_query = filter_query.where(
+                ProductRepo.get_category_filter_clause(categories, FilterMode.EXACT)
+            )
+        if styles:
+            filter_query = filter_query.where(
+                ProductRepo.get_filter_clause(
+                    product_tb.c.style, styles, FilterMode.EXACT
+                )
+            )
+
+        select_query = (
+            filter_query.with_only_columns(
+                *[columns_by_name[field].label(to_camel(field)) for field in fields]
+            )
+            .order_by(closet_item_tb.c.id)
+            .offset(offset)
+            .limit(size)
+        )
+        count_query = filter_query.with_only_columns(func.count())
+        results, total_rows = await asyncio.gather(
+            database.fetch_all(select_query), database.fetch_val(count_query)
+        )
+        return [dict(result._mapping) for result in results], total_rows
+
+    @invalidates
     async def delete_by_owner_id(self, owner_id: UUID) -> None:
         await database.fetch_one(
             closet_tb.delete().where(closet_item_tb.c.owner_id == owner_id)
@@ -1,32 +1,97 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 
 from src.auth.dependencies import valid_jwt_token
 from src.auth.schemas import JWTData
+from src.closet.constants import ClosetResponseMode
 from src.closet.dependencies import (
     get_closet_service,
     valid_closet,
+    valid_closet_bulk_update,
+    valid_closet_item_fields,
     valid_closet_update,
 )
-from src.closet.schemas import ClosetData, ClosetUpdate
+from src.closet.schemas import (
+    ClosetBulkResult,
+    ClosetData,
+    ClosetDelta,
+    ClosetItems,
+    ClosetUpdate,
+)
 from src.closet.service import ClosetService
+from src.responses import get_validator_headers, is_not_modified, not_modified_response
 
 router = APIRouter(prefix="/closets", tags=["Closets"])
 
 
 @router.get("/me")
 async def get_or_create_if_not_exist_my_closet(
+    request: Request,
+    response: Response,
     jwt_data: JWTData = Depends(valid_jwt_token),
     service: ClosetService = Depends(get_closet_service),
 ) -> ClosetData:
-    return await service.get_closet(owner_id=jwt_data.user_id)
+    version = await service.get_closet_version(owner_id=jwt_data.user_id)
+    if version and is_not_modified(
+        request, etag=version.etag, last_modified=version.last_modified
+    ):
+        return not_modified_response(
+            etag=version.etag, last_modified=version.last_modified
+        )
+
+    closet = await service.get_closet(owner_id=jwt_data.user_id)
+    if not version:
+        version = await service.get_closet_version(owner_id=jwt_data.user_id)
+    if version:
+        response.headers.update(
+            get_validator_headers(
+                etag=version.etag, last_modified=version.last_modified
+            )
+        )
+    return closet
+
+
+@router.get("/me/items")
+async def get_my_closet_items(
+    categories: list[str] = Query(default=[]),
+    styles: list[str] = Query(default=[]),
+    size: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+    fields: list[str] = Depends(valid_closet_item_fields),
+    jwt_data: JWTData = Depends(valid_jwt_token),
+    service: ClosetService = Depends(get_closet_service),
+) -> ClosetItems:
+    return await service.get_closet_items_page(
+        owner_id=jwt_data.user_id,
+        fields=fields,
+        categories=categories,
+        styles=styles,
+        offset=offset,
+        size=size,
+    )
+
+
+@router.post("/me/items/bulk")
+async def bulk_update_my_closet_items(
+    closet_update: ClosetUpdate = Depends(valid_closet_bulk_update),
+    jwt_data: JWTData = Depends(valid_jwt_token),
+    service: ClosetService = Depends(get_closet_service),
+) -> ClosetBulkResult:
+    return await service.bulk_update_closet(
+        owner_id=jwt_data.user_id, update_data=closet_update
+    )
 
 
 @router.put("/me")
 async def update_my_closet(
     closet_update: ClosetUpdate = Depends(valid_closet_update),
     closet: ClosetData = Depends(valid_closet),
+    response_mode: ClosetResponseMode = ClosetResponseMode.FULL,
     service: ClosetService = Depends(get_closet_service),
-) -> ClosetData:
+) -> ClosetData | ClosetDelta:
+    if response_mode == ClosetResponseMode.DELTA:
+        return await service.update_closet_delta(
+            closet=closet, update_data=closet_update
+        )
     return await service.update_closet(closet=closet, update_data=closet_update)
 
 
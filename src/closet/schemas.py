@@ -1,8 +1,10 @@
 from datetime import datetime
+from typing import Any
 from uuid import UUID
 
 from pydantic import Field
 
+from src.closet.constants import ClosetItemStatus
 from src.product.schemas import ProductData
 from src.schemas import BaseModel
 
@@ -12,6 +14,7 @@ class ClosetData(BaseModel):
     owner_id: UUID
     owned_products: list[ProductData] = []
     public_products: list[ProductData] = []
+    version: int | None
     created_at: datetime | None
     updated_at: datetime | None
 
@@ -24,3 +27,26 @@ class ClosetCreate(BaseModel):
 class ClosetUpdate(BaseModel):
     added_product_ids: list[int] = []
     removed_product_ids: list[int] = []
+
+
+class ClosetDelta(BaseModel):
+    id: UUID
+    version: int
+    added_products: list[ProductData] = []
+    removed_products: list[ProductData] = []
+
+
+class ClosetItems(BaseModel):
+    products: list[dict[str, Any]]
+    total_rows: int
+
+
+class ClosetItemOutcome(BaseModel):
+    product_id: int
+    status: ClosetItemStatus
+
+
+class ClosetBulkResult(BaseModel):
+    id: UUID
+    version: int
+    items: list[ClosetItemOutcome]
@@ -1,9 +1,23 @@
 from uuid import UUID
 
+from src.closet.constants import ClosetItemStatus
 from src.closet.repository import ClosetRepo
-from src.closet.schemas import ClosetCreate, ClosetData, ClosetUpdate
+from src.closet.schemas import (
+    ClosetBulkResult,
+    ClosetData,
+    ClosetDelta,
+    ClosetItems,
+    ClosetUpdate,
+)
 from src.product.repository import ProductRepo
 from src.product.schemas import ProductData
+from src.product.utils import match_vocabulary
+from src.recommendation.cache import recommendation_cache
+from src.recommendation.config import settings as recommendation_settings
+from src.recommendation.exceptions import RecommendationJobQueueFull
+from src.recommendation.jobs import recommendation_jobs
+from src.recommendation.schemas import RecommendationJobPayload
+from src.schemas import ResourceVersion
 
 
 class ClosetService:
@@ -11,35 +25,102 @@ class ClosetService:
         self.closet_repo = closet_repo
         self.product_repo = product_repo
 
-    async def get_or_create_closet_if_not_exist(self, owner_id: UUID) -> ClosetData:
+    async def get_closet_items(self, closet_id: UUID) -> list[ProductData]:
+        return await self.closet_repo.get_closet_items(closet_id=closet_id)
+
+    async def get_closet_items_page(
+        self,
+        owner_id: UUID,
+        fields: list[str],
+        categories: list[str] | None = None,
+        styles: list[str] | None = None,
+        offset: int = 0,
+        size: int = 20,
+    ) -> ClosetItems:
         closet = await self.closet_repo.get_by_owner_id(owner_id=owner_id)
         if not closet:
-            closet = await self.closet_repo.create(
-                create_data=ClosetCreate(owner_id=owner_id)
+            return ClosetItems(products=[], total_rows=0)
+
+        # Filters match exactly, like product listings in FilterMode.EXACT
+        if categories:
+            categories = match_vocabulary(
+                categories, await self.product_repo.get_categories()
             )
-        return closet
+        if styles:
+            styles = match_vocabulary(styles, await self.product_repo.get_styles())
 
-    async def get_closet_items(self, closet_id: UUID) -> list[ProductData]:
-        return await self.closet_repo.get_closet_items(closet_id=closet_id)
+        products, total_rows = await self.closet_repo.get_closet_items_page(
+            closet_id=closet.id,
+            fields=fields,
+            categories=categories,
+            styles=styles,
+            offset=offset,
+            size=size,
+        )
+        return ClosetItems(products=products, total_rows=total_rows)
+
+    async def get_closet_version(self, owner_id: UUID) -> ResourceVersion | None:
+        return await self.closet_repo.get_closet_version(owner_id=owner_id)
 
     async def get_closet(self, owner_id: UUID) -> ClosetData:
-        closet = await self.get_or_create_closet_if_not_exist(owner_id=owner_id)
-        closet_items = await self.get_closet_items(closet_id=closet.id)
-        closet.owned_products = [
-            closet_item
-            for closet_item in closet_items
-            if closet_item.owner_id == owner_id
-        ]
-        closet.public_products = [
-            closet_item
-            for closet_item in closet_items
-            if closet_item.owner_id != owner_id
-        ]
-        return closet
+        return await self.closet_repo.get_or_create_with_items(owner_id=owner_id)
 
     async def update_closet(
         self, closet: ClosetData, update_data: ClosetUpdate
     ) -> ClosetData:
+        await self.apply_closet_update(closet=closet, update_data=update_data)
+        return await self.get_closet(owner_id=closet.owner_id)
+
+    async def update_closet_delta(
+        self, closet: ClosetData, update_data: ClosetUpdate
+    ) -> ClosetDelta:
+        version = await self.apply_closet_update(closet=closet, update_data=update_data)
+        removed_product_ids = set(update_data.removed_product_ids)
+        return ClosetDelta(
+            id=closet.id,
+            version=version,
+            added_products=await self.product_repo.get_by_ids_in_order(
+                ids=update_data.added_product_ids, user_id=closet.owner_id
+            ),
+            removed_products=[
+                product
+                for product in [*closet.owned_products, *closet.public_products]
+                if product.id in removed_product_ids
+            ],
+        )
+
+    async def bulk_update_closet(
+        self, owner_id: UUID, update_data: ClosetUpdate
+    ) -> ClosetBulkResult:
+        closet = await self.closet_repo.get_or_create(owner_id=owner_id)
+        items, version = await self.closet_repo.apply_bulk_update(
+            closet_id=closet.id,
+            owner_id=owner_id,
+            added_product_ids=update_data.added_product_ids,
+            removed_product_ids=update_data.removed_product_ids,
+        )
+        if version is None:
+            return ClosetBulkResult(id=closet.id, version=closet.version, items=items)
+
+        await recommendation_cache.invalidate_products(
+            [
+                item.product_id
+                for item in items
+                if item.status in (ClosetItemStatus.ADDED, ClosetItemStatus.REMOVED)
+            ]
+        )
+        await self.precompute_recommendations(owner_id=owner_id)
+        return ClosetBulkResult(id=closet.id, version=version, items=items)
+
+    async def apply_closet_update(
+        self, closet: ClosetData, update_data: ClosetUpdate
+    ) -> int:
+        """
+        Writes the item changes and returns the resulting closet version.
+        """
+        if not update_data.removed_product_ids and not update_data.added_product_ids:
+            return closet.version  # type: ignore
+
         if update_data.removed_product_ids:
             await self.closet_repo.delete_closet_items(
                 closet_id=closet.id, product_ids=update_data.removed_product_ids
@@ -48,18 +129,28 @@ class ClosetService:
             await self.closet_repo.create_closet_items(
                 closet_id=closet.id, product_ids=update_data.added_product_ids
             )
-        closet_items = await self.get_closet_items(closet_id=closet.id)
-        closet.owned_products = [
-            closet_item
-            for closet_item in closet_items
-            if closet_item.owner_id == closet.owner_id
-        ]
-        closet.public_products = [
-            closet_item
-            for closet_item in closet_items
-            if closet_item.owner_id != closet.owner_id
-        ]
-        return closet
+        version = await self.closet_repo.touch(closet_id=closet.id)
+        await recommendation_cache.invalidate_products(
+            [*update_data.removed_product_ids, *update_data.added_product_ids]
+        )
+        await self.precompute_recommendations(owner_id=closet.owner_id)
+        return version
+
+    async def precompute_recommendations(self, owner_id: UUID) -> None:
+        """
+        Warms the recommendation cache in the background, so the next request for
+        the default page doesn't wait on the model. Skipped when the queue is full,
+        and coalesced with a precompute still pending for the same closet.
+        """
+        try:
+            await recommendation_jobs.submit(
+                RecommendationJobPayload(
+                    owner_id=owner_id,
+                    size=recommendation_settings.RECOMMENDATION_PRECOMPUTE_SIZE,
+                )
+            )
+        except RecommendationJobQueueFull:
+            pass
 
     async def delete_closet(self, owner_id: UUID) -> None:
         await self.closet_repo.delete_by_owner_id(owner_id=owner_id)
@@ -29,6 +29,7 @@ closet_tb = Table(
         unique=True,
         index=True,
     ),
+    Column("version", Integer, nullable=False, server_default=text("1")),
     Column("created_at", DateTime(timezone=True), server_default=func.now()),
     Column(
         "updated_at",
@@ -1,5 +1,8 @@
+import orjson
 from databases import Database
 from sqlalchemy import MetaData, create_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import ClauseElement, Executable, Select
 
 from src.config import settings
 from src.constants import DB_NAMING_CONVENTION
@@ -10,3 +13,26 @@ engine = create_engine(DATABASE_URL)
 metadata = MetaData(naming_convention=DB_NAMING_CONVENTION)
 
 database = Database(DATABASE_URL, force_rollback=settings.ENVIRONMENT.is_testing)
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}"
+
+
+async def fetch_estimated_rows(select_query: Select) -> int:
+    """
+    Returns the planner's row estimate for the query without executing it.
+    """
+    result = await database.fetch_one(Explain(select_query))
+    query_plan = result._mapping["QUERY PLAN"]  # type: ignore
+    if isinstance(query_plan, str):
+        query_plan = orjson.loads(query_plan)
+    return int(query_plan[0]["Plan"]["Plan Rows"])
@@ -31,3 +31,13 @@ class NotAuthenticated(DetailedHTTPException):
 
     def __init__(self) -> None:
         super().__init__(headers={"WWW-Authenticate": "Bearer"})
+
+
+class ServiceUnavailable(DetailedHTTPException):
+    STATUS_CODE = status.HTTP_503_SERVICE_UNAVAILABLE
+    DETAIL = "Service unavailable"
+
+
+class TooManyRequests(DetailedHTTPException):
+    STATUS_CODE = status.HTTP_429_TOO_MANY_REQUESTS
+    DETAIL = "Too many requests"
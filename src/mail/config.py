@@ -0,0 +1,27 @@
+from pydantic import BaseSettings
+
+from src.mail.constants import MailTransportType
+
+
+class Settings(BaseSettings):
+    SENDER_EMAIL: str
+    SENDER_EMAIL_PASSWORD: str
+
+    MAIL_TRANSPORT: MailTransportType = MailTransportType.SMTP
+    MAIL_SMTP_HOST: str = "smtp.gmail.com"
+    MAIL_SMTP_PORT: int = 587
+    MAIL_SMTP_START_TLS: bool = True
+    MAIL_SMTP_LOGIN: bool = True
+    MAIL_SMTP_TIMEOUT_SECONDS: float = 10
+    MAIL_SMTP_POOL_SIZE: int = 2
+
+    MAIL_QUEUE_MAXSIZE: int = 1000
+    MAIL_ENQUEUE_TIMEOUT_SECONDS: float = 1
+    MAIL_BATCH_SIZE: int = 20
+    MAIL_BATCH_MAX_WAIT_SECONDS: float = 0.5
+    MAIL_MAX_RETRIES: int = 3
+    MAIL_RETRY_BACKOFF_SECONDS: float = 1
+    MAIL_SHUTDOWN_TIMEOUT_SECONDS: float = 10
+
+
+settings = Settings()
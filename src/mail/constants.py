@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class MailTransportType(str, Enum):
+    SMTP = "SMTP"
+    MEMORY = "MEMORY"
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+from email.message import EmailMessage
+
+from src.mail.config import settings
+from src.mail.transport import MailTransport, mail_transport
+
+logger = logging.getLogger(__name__)
+
+
+class MailSender:
+    """
+    Delivers outgoing mails in the background. Queued mails are taken in batches
+    and sent concurrently over the transport, a mail that fails is retried with
+    exponential backoff without holding back the rest of its batch.
+
+    The queue is bounded: producers wait up to `enqueue_timeout` for room and the
+    mail is dropped afterwards.
+    """
+
+    def __init__(
+        self,
+        transport: MailTransport,
+        maxsize: int,
+        enqueue_timeout: float,
+        batch_size: int,
+        batch_max_wait: float,
+        max_retries: int,
+        retry_backoff: float,
+        shutdown_timeout: float,
+    ):
+        self.transport = transport
+        self.enqueue_timeout = enqueue_timeout
+        self.batch_size = batch_size
+        self.batch_max_wait = batch_max_wait
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.shutdown_timeout = shutdown_timeout
+        self._queue: asyncio.Queue[EmailMessage] = asyncio.Queue(maxsize=maxsize)
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            await self.transport.connect()
+            self._task = asyncio.create_task(self._work())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        # Give the mails already accepted a chance to go out before shutting down
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=self.shutdown_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Dropped %s queued mails on shutdown", self._queue.qsize())
+
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        await self.transport.disconnect()
+
+    async def submit(self, message: EmailMessage) -> bool:
+        try:
+            await asyncio.wait_for(
+                self._queue.put(message), timeout=self.enqueue_timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Mail queue is full, dropped mail to %s", message["To"])
+            return False
+
+        return True
+
+    async def _next_batch(self) -> list[EmailMessage]:
+        batch = [await self._queue.get()]
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_max_wait
+        while len(batch) < self.batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _work(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            try:
+                await asyncio.gather(*(self._deliver(message) for message in batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _deliver(self, message: EmailMessage) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self.transport.send(message)
+                return
+            except Exception:
+                if attempt == self.max_retries:
+                    logger.exception(
+                        "Failed to send mail to %s, giving up", message["To"]
+                    )
+                    return
+                await asyncio.sleep(self.retry_backoff * 2**attempt)
+
+
+mail_sender = MailSender(
+    transport=mail_transport,
+    maxsize=settings.MAIL_QUEUE_MAXSIZE,
+    enqueue_timeout=settings.MAIL_ENQUEUE_TIMEOUT_SECONDS,
+    batch_size=settings.MAIL_BATCH_SIZE,
+    batch_max_wait=settings.MAIL_BATCH_MAX_WAIT_SECONDS,
+    max_retries=settings.MAIL_MAX_RETRIES,
+    retry_backoff=settings.MAIL_RETRY_BACKOFF_SECONDS,
+    shutdown_timeout=settings.MAIL_SHUTDOWN_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,119 @@
+import asyncio
+from abc import ABC, abstractmethod
+from email.message import EmailMessage
+
+import aiosmtplib
+
+from src.mail.config import settings
+from src.mail.constants import MailTransportType
+
+
+class MailTransport(ABC):
+    async def connect(self) -> None:
+        ...
+
+    async def disconnect(self) -> None:
+        ...
+
+    @abstractmethod
+    async def send(self, message: EmailMessage) -> None:
+        """
+        Raises if the message could not be handed over to the mail server.
+        """
+
+
+class SMTPTransport(MailTransport):
+    """
+    Keeps `pool_size` authenticated SMTP sessions open and hands them out to
+    senders, so STARTTLS and login are paid once per connection instead of once
+    per mail. A session dropped by the server is reopened on its next use.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: str | None,
+        password: str | None,
+        start_tls: bool,
+        timeout: float,
+        pool_size: int,
+    ):
+        self._clients = [
+            aiosmtplib.SMTP(
+                hostname=hostname,
+                port=port,
+                username=username,
+                password=password,
+                start_tls=start_tls,
+                timeout=timeout,
+            )
+            for _ in range(pool_size)
+        ]
+        self._idle: asyncio.Queue[aiosmtplib.SMTP] = asyncio.Queue()
+
+    async def connect(self) -> None:
+        # Sessions are opened lazily, an unreachable mail server must not prevent
+        # the app from starting
+        for client in self._clients:
+            self._idle.put_nowait(client)
+
+    async def disconnect(self) -> None:
+        for client in self._clients:
+            if client.is_connected:
+                try:
+                    await client.quit()
+                except aiosmtplib.SMTPException:
+                    client.close()
+        self._idle = asyncio.Queue()
+
+    async def send(self, message: EmailMessage) -> None:
+        client = await self._idle.get()
+        try:
+            await self._send(client, message)
+        finally:
+            self._idle.put_nowait(client)
+
+    async def _send(self, client: aiosmtplib.SMTP, message: EmailMessage) -> None:
+        if not client.is_connected:
+            await client.connect()
+        try:
+            await client.send_message(message)
+        except aiosmtplib.SMTPServerDisconnected:
+            # Idle sessions get closed by the server, retry once on a fresh one
+            client.close()
+            await client.connect()
+            await client.send_message(message)
+
+
+class InMemoryTransport(MailTransport):
+    """
+    Keeps sent messages in `outbox` instead of delivering them, for local
+    development and tests.
+    """
+
+    def __init__(self) -> None:
+        self.outbox: list[EmailMessage] = []
+
+    async def send(self, message: EmailMessage) -> None:
+        self.outbox.append(message)
+
+
+def get_mail_transport(
+    transport_type: MailTransportType = settings.MAIL_TRANSPORT,
+) -> MailTransport:
+    if transport_type == MailTransportType.MEMORY:
+        return InMemoryTransport()
+
+    return SMTPTransport(
+        hostname=settings.MAIL_SMTP_HOST,
+        port=settings.MAIL_SMTP_PORT,
+        username=settings.SENDER_EMAIL if settings.MAIL_SMTP_LOGIN else None,
+        password=settings.SENDER_EMAIL_PASSWORD if settings.MAIL_SMTP_LOGIN else None,
+        start_tls=settings.MAIL_SMTP_START_TLS,
+        timeout=settings.MAIL_SMTP_TIMEOUT_SECONDS,
+        pool_size=settings.MAIL_SMTP_POOL_SIZE,
+    )
+
+
+mail_transport = get_mail_transport()
@@ -6,11 +6,19 @@ from fastapi.middleware.gzip import GZipMiddleware
 
 from src.admin.router import router as admin_router
 from src.auth.router import router as auth_router
+from src.auth.security import shutdown_password_hasher
 from src.closet.router import router as closet_router
 from src.config import app_configs, settings
 from src.database import database
+from src.mail.sender import mail_sender
 from src.payment.router import router as payment_router
 from src.product.router import router as product_router
+from src.product.service import run_recommendation_job
+from src.recommendation.client import recommendation_client
+from src.recommendation.ingestion import embedding_pipeline
+from src.recommendation.jobs import recommendation_jobs
+from src.recommendation.service import load_vector_index
+from src.repository import IdentityMapMiddleware
 from src.user.router import router as user_router
 
 
@@ -18,11 +26,21 @@ from src.user.router import router as user_router
 async def lifespan(app: FastAPI):
     # Connect DB on start
     await database.connect()
+    await recommendation_client.connect()
+    await load_vector_index()
+    await recommendation_jobs.start(handler=run_recommendation_job)
+    await embedding_pipeline.start()
+    await mail_sender.start()
 
     yield
 
-    # Disconnect DB on shutdown
+    # Disconnect DB and close pooled connections on shutdown
+    await mail_sender.stop()
+    await embedding_pipeline.stop()
+    await recommendation_jobs.stop()
+    await recommendation_client.disconnect()
     await database.disconnect()
+    shutdown_password_hasher()
 
 
 app = FastAPI(**app_configs, lifespan=lifespan)
@@ -36,6 +54,7 @@ app.add_middleware(
     allow_headers=settings.CORS_HEADERS,
 )
 app.add_middleware(GZipMiddleware, minimum_size=1000)
+app.add_middleware(IdentityMapMiddleware)
 
 
 @app.get("/healthcheck", include_in_schema=False)
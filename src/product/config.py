@@ -0,0 +1,14 @@
+from pydantic import BaseSettings
+
+from src.product.constants import CountStrategy
+
+
+class Settings(BaseSettings):
+    PRODUCT_COUNT_STRATEGY: CountStrategy = CountStrategy.EXACT
+    PRODUCT_COUNT_CACHE_TTL_SECONDS: int = 60
+    PRODUCT_COUNT_CACHE_MAXSIZE: int = 1024
+
+    PRODUCT_VOCABULARY_CACHE_TTL_SECONDS: int = 300
+
+
+settings = Settings()
@@ -0,0 +1,32 @@
+from enum import Enum
+
+# Text search configuration created by the `add_product_search_vector` migration.
+# It is a copy of `simple` whose words go through the `unaccent` dictionary first,
+# so "ao so mi" matches "Áo sơ mi".
+SEARCH_TS_CONFIG = "vn_unaccent"
+
+
+class SearchMode(str, Enum):
+    FULL_TEXT = "FULL_TEXT"
+    SUBSTRING = "SUBSTRING"
+
+
+class PaginationMode(str, Enum):
+    OFFSET = "OFFSET"
+    CURSOR = "CURSOR"
+
+
+class CursorKey(str, Enum):
+    CREATED_AT = "CREATED_AT"
+    SEARCH_RANK = "SEARCH_RANK"
+
+
+class CountStrategy(str, Enum):
+    EXACT = "EXACT"
+    ESTIMATE = "ESTIMATE"
+    CACHED = "CACHED"
+
+
+class FilterMode(str, Enum):
+    EXACT = "EXACT"
+    FUZZY = "FUZZY"
@@ -7,12 +7,22 @@ from src.product.exceptions import NotReviewedProductYet, ProductPermissionDenie
 from src.product.repository import ProductRepo
 from src.product.schemas import ProductCreate, ProductData, ProductReviewData
 from src.product.service import ProductService
+from src.recommendation.cache import recommendation_cache
+from src.recommendation.dependencies import get_recommendation_service
+from src.recommendation.service import RecommendationService
 
 
 async def get_product_service(
-    product_repo: ProductRepo = Depends(), closet_repo: ClosetRepo = Depends()
+    product_repo: ProductRepo = Depends(),
+    closet_repo: ClosetRepo = Depends(),
+    recommendation_service: RecommendationService = Depends(get_recommendation_service),
 ) -> ProductService:
-    return ProductService(product_repo=product_repo, closet_repo=closet_repo)
+    return ProductService(
+        product_repo=product_repo,
+        closet_repo=closet_repo,
+        recommendation_service=recommendation_service,
+        recommendation_cache=recommendation_cache,
+    )
 
 
 async def valid_product_id(
@@ -15,3 +15,7 @@ class AlreadyReviewedProduct(BadRequest):
 
 class NotReviewedProductYet(BadRequest):
     DETAIL = "User hasn't reviewed this product yet!"
+
+
+class InvalidCursor(BadRequest):
+    DETAIL = "The given cursor is invalid!"
@@ -1,10 +1,34 @@
 import asyncio
+from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import and_, func, or_, select
-from sqlalchemy.sql import Select
-
-from src.database import database
+from sqlalchemy import (
+    BigInteger,
+    and_,
+    case,
+    exists,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
+from sqlalchemy.sql import ColumnElement, Select
+
+from src.cache import TTLCache
+from src.database import database, fetch_estimated_rows
+from src.product.config import settings
+from src.product.constants import (
+    SEARCH_TS_CONFIG,
+    CountStrategy,
+    CursorKey,
+    FilterMode,
+    PaginationMode,
+    SearchMode,
+)
 from src.product.schemas import (
     ProductCreate,
     ProductData,
@@ -18,128 +42,140 @@ from src.product.schemas import (
 from src.product.table import (
     category_tb,
     product_category_tb,
+    product_data_columns,
+    product_embedding_tb,
     product_rating_tb,
     product_review_tb,
     product_tb,
 )
+from src.product.utils import decode_cursor, encode_cursor
+from src.recommendation.cache import recommendation_cache
+from src.repository import invalidates, memoized
+from src.schemas import ResourceVersion
 from src.user.schemas import UserData
 from src.user.table import user_tb
 
+_total_rows_cache: TTLCache[tuple, int] = TTLCache(
+    maxsize=settings.PRODUCT_COUNT_CACHE_MAXSIZE,
+    ttl=settings.PRODUCT_COUNT_CACHE_TTL_SECONDS,
+)
+_vocabulary_cache: TTLCache[str, list[str]] = TTLCache(
+    maxsize=8, ttl=settings.PRODUCT_VOCABULARY_CACHE_TTL_SECONDS
+)
+
 
 class ProductRepo:
     @staticmethod
-    def get_base_select_query(
-        ids: list[int] | None = None,
-        owner_id: UUID | None = None,
-        categories: list[str] | None = None,
-        styles: list[str] | None = None,
-        patterns: list[str] | None = None,
-        search_keyword: str | None = None,
-        offset: int | None = None,
-        size: int | None = None,
-    ) -> Select:
-        select_query = (
-            select(
-                product_tb,
-                func.array_agg(category_tb.c.name).label("categories"),
-            )
-            .select_from(product_tb)
-            .join(product_category_tb)
-            .join(category_tb)
-            .group_by(product_tb.c.id)
+    def get_search_query(search_keyword: str) -> ColumnElement:
+        return func.websearch_to_tsquery(
+            literal_column(f"'{SEARCH_TS_CONFIG}'::regconfig"), search_keyword
         )
-        if ids:
-            select_query = select_query.where(product_tb.c.id.in_(ids))
 
-        if categories:
-            select_query = select_query.where(
-                or_(
-                    *[
-                        category_tb.c.name.ilike(f"%{category}%")
-                        for category in categories
-                    ]
-                )
-            )
-
-        if styles:
-            select_query = select_query.where(
-                or_(*[product_tb.c.style.ilike(f"%{style}%") for style in styles])
+    @staticmethod
+    def get_search_clause(
+        search_keyword: str, search_mode: SearchMode
+    ) -> ColumnElement:
+        if search_mode == SearchMode.FULL_TEXT:
+            return product_tb.c.search_vector.op("@@")(
+                ProductRepo.get_search_query(search_keyword)
             )
 
-        if patterns:
-            select_query = select_query.where(
-                or_(
-                    *[
-                        product_tb.c.pattern.ilike(f"%{pattern}%")
-                        for pattern in patterns
-                    ]
-                )
-            )
+        ilike_pattern = f"%{search_keyword}%"
+        return or_(
+            product_tb.c.name.ilike(ilike_pattern),
+            product_tb.c.description.ilike(ilike_pattern),
+            product_tb.c.brand.ilike(ilike_pattern),
+            product_tb.c.pattern.ilike(ilike_pattern),
+            product_tb.c.style.ilike(ilike_pattern),
+        )
 
-        if owner_id:
-            select_query = select_query.filter(product_tb.c.owner_id == owner_id)
-        else:
-            select_query = select_query.filter(product_tb.c.is_public)
+    @staticmethod
+    def get_filter_clause(
+        column: ColumnElement, values: list[str], filter_mode: FilterMode
+    ) -> ColumnElement:
+        if filter_mode == FilterMode.EXACT:
+            return column.in_(values)
+        return or_(*[column.ilike(f"%{value}%") for value in values])
 
-        if search_keyword:
-            ilike_pattern = f"%{search_keyword}%"
-            select_query = select_query.filter(
-                or_(
-                    product_tb.c.name.ilike(ilike_pattern),
-                    product_tb.c.description.ilike(ilike_pattern),
-                    product_tb.c.brand.ilike(ilike_pattern),
-                    product_tb.c.pattern.ilike(ilike_pattern),
-                    product_tb.c.style.ilike(ilike_pattern),
+    @staticmethod
+    def get_category_filter_clause(
+        categories: list[str], filter_mode: FilterMode
+    ) -> ColumnElement:
+        if filter_mode == FilterMode.EXACT:
+            return product_tb.c.category_names.overlap(categories)
+
+        return product_tb.c.id.in_(
+            select(product_category_tb.c.product_id)
+            .join(category_tb)
+            .where(
+                ProductRepo.get_filter_clause(
+                    category_tb.c.name, categories, filter_mode
                 )
             )
+        )
 
-        if offset:
-            select_query = select_query.offset(offset)
+    @staticmethod
+    def get_sort_column(
+        search_keyword: str | None, search_mode: SearchMode
+    ) -> tuple[CursorKey, ColumnElement]:
+        if search_keyword and search_mode == SearchMode.FULL_TEXT:
+            return CursorKey.SEARCH_RANK, func.ts_rank_cd(
+                product_tb.c.search_vector,
+                ProductRepo.get_search_query(search_keyword),
+            )
+        return CursorKey.CREATED_AT, product_tb.c.created_at
 
-        if size:
-            select_query = select_query.limit(size)
+    @staticmethod
+    def get_hydrate_query(user_id: UUID | None = None) -> Select:
+        """
+        Selects every column `ProductData` needs. Callers narrow it down to the
+        products they want, so the wide rows are only read for those.
+        """
+        select_query = select(*product_data_columns).select_from(product_tb)
+        if user_id:
+            select_query = select_query.add_columns(
+                product_rating_tb.c.score.label("my_rating_score")
+            ).join(
+                product_rating_tb,
+                isouter=True,
+                onclause=and_(
+                    product_tb.c.id == product_rating_tb.c.product_id,
+                    product_rating_tb.c.user_id == user_id,
+                ),
+            )
         return select_query
 
     @staticmethod
-    def get_total_rows_query(
+    def get_filtered_query(
+        columns: list[ColumnElement],
         ids: list[int] | None = None,
         owner_id: UUID | None = None,
         categories: list[str] | None = None,
         styles: list[str] | None = None,
         patterns: list[str] | None = None,
         search_keyword: str | None = None,
+        search_mode: SearchMode = SearchMode.FULL_TEXT,
+        filter_mode: FilterMode = FilterMode.EXACT,
     ) -> Select:
-        select_query = select(func.count()).select_from(product_tb)
+        select_query = select(*columns).select_from(product_tb)
 
         if ids:
             select_query = select_query.where(product_tb.c.id.in_(ids))
 
         if categories:
-            select_query = (
-                select_query.join(product_category_tb)
-                .join(category_tb)
-                .where(
-                    or_(
-                        *[
-                            category_tb.c.name.ilike(f"%{category}%")
-                            for category in categories
-                        ]
-                    )
-                )
+            select_query = select_query.where(
+                ProductRepo.get_category_filter_clause(categories, filter_mode)
             )
 
         if styles:
             select_query = select_query.where(
-                or_(*[product_tb.c.style.ilike(f"%{style}%") for style in styles])
+                ProductRepo.get_filter_clause(product_tb.c.style, styles, filter_mode)
             )
 
         if patterns:
             select_query = select_query.where(
-                or_(
-                    *[
-                        product_tb.c.pattern.ilike(f"%{pattern}%")
-                        for pattern in patterns
-                    ]
+                ProductRepo.get_filter_clause(
+                    product_tb.c.pattern, patterns, filter_mode
                 )
             )
 
@@ -149,18 +185,83 @@ class ProductRepo:
             select_query = select_query.where(product_tb.c.is_public)
 
         if search_keyword:
-            ilike_pattern = f"%{search_keyword}%"
             select_query = select_query.where(
-                or_(
-                    product_tb.c.name.ilike(ilike_pattern),
-                    product_tb.c.description.ilike(ilike_pattern),
-                    product_tb.c.brand.ilike(ilike_pattern),
-                    product_tb.c.pattern.ilike(ilike_pattern),
-                    product_tb.c.style.ilike(ilike_pattern),
-                )
+                ProductRepo.get_search_clause(search_keyword, search_mode)
             )
         return select_query
 
+    @staticmethod
+    def get_base_select_query(
+        ids: list[int] | None = None,
+        owner_id: UUID | None = None,
+        categories: list[str] | None = None,
+        styles: list[str] | None = None,
+        patterns: list[str] | None = None,
+        search_keyword: str | None = None,
+        search_mode: SearchMode = SearchMode.FULL_TEXT,
+        filter_mode: FilterMode = FilterMode.EXACT,
+        after: tuple[datetime | float, int] | None = None,
+        offset: int | None = None,
+        size: int | None = None,
+    ) -> Select:
+        # Filter, sort and limit on ids only, then hydrate just the selected page
+        _, sort_column = ProductRepo.get_sort_column(search_keyword, search_mode)
+        page_query = ProductRepo.get_filtered_query(
+            columns=[product_tb.c.id, sort_column.label("sort_value")],
+            ids=ids,
+            owner_id=owner_id,
+            categories=categories,
+            styles=styles,
+            patterns=patterns,
+            search_keyword=search_keyword,
+            search_mode=search_mode,
+            filter_mode=filter_mode,
+        ).order_by(sort_column.desc(), product_tb.c.id.desc())
+
+        if after:
+            sort_value, product_id = after
+            page_query = page_query.where(
+                tuple_(sort_column, product_tb.c.id)
+                < tuple_(literal(sort_value), literal(product_id))
+            )
+
+        if offset:
+            page_query = page_query.offset(offset)
+
+        if size:
+            page_query = page_query.limit(size)
+
+        page = page_query.subquery("page")
+        return (
+            ProductRepo.get_hydrate_query()
+            .add_columns(page.c.sort_value)
+            .join(page, onclause=page.c.id == product_tb.c.id)
+            .order_by(page.c.sort_value.desc(), page.c.id.desc())
+        )
+
+    @staticmethod
+    def get_total_rows_query(
+        ids: list[int] | None = None,
+        owner_id: UUID | None = None,
+        categories: list[str] | None = None,
+        styles: list[str] | None = None,
+        patterns: list[str] | None = None,
+        search_keyword: str | None = None,
+        search_mode: SearchMode = SearchMode.FULL_TEXT,
+        filter_mode: FilterMode = FilterMode.EXACT,
+    ) -> Select:
+        return ProductRepo.get_filtered_query(
+            columns=[func.count()],
+            ids=ids,
+            owner_id=owner_id,
+            categories=categories,
+            styles=styles,
+            patterns=patterns,
+            search_keyword=search_keyword,
+            search_mode=search_mode,
+            filter_mode=filter_mode,
+        )
+
     async def get_multi(
         self,
         ids: list[int] | None = None,
@@ -169,9 +270,28 @@ class ProductRepo:
         styles: list[str] | None = None,
         patterns: list[str] | None = None,
         search_keyword: str | None = None,
+        search_mode: SearchMode = SearchMode.FULL_TEXT,
+        filter_mode: FilterMode = FilterMode.EXACT,
+        pagination_mode: PaginationMode = PaginationMode.OFFSET,
+        cursor: str | None = None,
+        count_strategy: CountStrategy | None = None,
         offset: int | None = None,
         size: int | None = None,
     ) -> ProductDatas:
+        if cursor or pagination_mode == PaginationMode.CURSOR:
+            return await self.get_multi_by_cursor(
+                ids=ids,
+                owner_id=owner_id,
+                categories=categories,
+                styles=styles,
+                patterns=patterns,
+                search_keyword=search_keyword,
+                search_mode=search_mode,
+                filter_mode=filter_mode,
+                cursor=cursor,
+                size=size,
+            )
+
         select_query = self.get_base_select_query(
             ids=ids,
             owner_id=owner_id,
@@ -179,9 +299,63 @@ class ProductRepo:
             styles=styles,
             patterns=patterns,
             search_keyword=search_keyword,
+            search_mode=search_mode,
+            filter_mode=filter_mode,
             offset=offset,
             size=size,
         )
+        results, (total_rows, is_total_rows_exact) = await asyncio.gather(
+            database.fetch_all(select_query),
+            self.get_total_rows(
+                ids=ids,
+                owner_id=owner_id,
+                categories=categories,
+                styles=styles,
+                patterns=patterns,
+                search_keyword=search_keyword,
+                search_mode=search_mode,
+                filter_mode=filter_mode,
+                count_strategy=count_strategy,
+            ),
+        )
+        return ProductDatas(
+            products=[ProductData(**result._mapping) for result in results],
+            total_rows=total_rows,
+            is_total_rows_exact=is_total_rows_exact,
+        )
+
+    async def get_total_rows(
+        self,
+        ids: list[int] | None = None,
+        owner_id: UUID | None = None,
+        categories: list[str] | None = None,
+        styles: list[str] | None = None,
+        patterns: list[str] | None = None,
+        search_keyword: str | None = None,
+        search_mode: SearchMode = SearchMode.FULL_TEXT,
+        filter_mode: FilterMode = FilterMode.EXACT,
+        count_strategy: CountStrategy | None = None,
+    ) -> tuple[int, bool]:
+        """
+        Returns the number of matching products and whether that number is exact.
+        """
+        count_strategy = count_strategy or settings.PRODUCT_COUNT_STRATEGY
+        if count_strategy == CountStrategy.ESTIMATE:
+            total_rows = await fetch_estimated_rows(
+                self.get_filtered_query(
+                    columns=[product_tb.c.id],
+                    ids=ids,
+                    owner_id=owner_id,
+                    categories=categories,
+                    styles=styles,
+                    patterns=patterns,
+                    search_keyword=search_keyword,
+                    search_mode=search_mode,
+                    filter_mode=filter_mode,
+                )
+            )
+            return total_rows, False
+
         select_total_row_query = self.get_total_rows_query(
             ids=ids,
             owner_id=owner_id,
@@ -189,19 +363,92 @@ class ProductRepo:
             styles=styles,
             patterns=patterns,
             search_keyword=search_keyword,
+            search_mode=search_mode,
+            filter_mode=filter_mode,
         )
-        results, total_rows = await asyncio.gather(
-            database.fetch_all(select_query), database.fetch_val(select_total_row_query)
+
+        if count_strategy == CountStrategy.CACHED:
+            # Keyed on the values exactly as queried, EXACT filters are case-sensitive
+            cache_key = (
+                owner_id,
+                tuple(sorted(set(ids or []))),
+                tuple(sorted(set(categories or []))),
+                tuple(sorted(set(styles or []))),
+                tuple(sorted(set(patterns or []))),
+                search_keyword or "",
+                search_mode,
+                filter_mode,
+            )
+            total_rows = _total_rows_cache.get(cache_key)
+            if total_rows is not None:
+                return total_rows, False
+
+            total_rows = await database.fetch_val(select_total_row_query)
+            _total_rows_cache.set(cache_key, total_rows)
+            return total_rows, True
+
+        return await database.fetch_val(select_total_row_query), True
+
+    async def get_multi_by_cursor(
+        self,
+        ids: list[int] | None = None,
+        owner_id: UUID | None = None,
+        categories: list[str] | None = None,
+        styles: list[str] | None = None,
+        patterns: list[str] | None = None,
+        search_keyword: str | None = None,
+        search_mode: SearchMode = SearchMode.FULL_TEXT,
+        filter_mode: FilterMode = FilterMode.EXACT,
+        cursor: str | None = None,
+        size: int | None = None,
+    ) -> ProductDatas:
+        """
+        Keyset pagination over (sort value, id). No total count is computed, the
+        client keeps requesting `next_cursor` until it comes back empty.
+        """
+        cursor_key, _ = self.get_sort_column(search_keyword, search_mode)
+        after = decode_cursor(cursor, key=cursor_key) if cursor else None
+        select_query = self.get_base_select_query(
+            ids=ids,
+            owner_id=owner_id,
+            categories=categories,
+            styles=styles,
+            patterns=patterns,
+            search_keyword=search_keyword,
+            search_mode=search_mode,
+            filter_mode=filter_mode,
+            after=after,
+            # Fetch one extra row to know whether there is a next page
+            size=size + 1 if size else None,
         )
+        results = await database.fetch_all(select_query)
+
+        next_cursor = None
+        if size and len(results) > size:
+            results = results[:size]
+            last_result = results[-1]._mapping
+            next_cursor = encode_cursor(
+                key=cursor_key,
+                sort_value=last_result["sort_value"],
+                product_id=last_result["id"],
+            )
         return ProductDatas(
             products=[ProductData(**result._mapping) for result in results],
-            total_rows=total_rows,
+            next_cursor=next_cursor,
         )
 
     async def get_categories(self) -> list[str]:
-        select_query = select(category_tb.c.name)
-        results = await database.fetch_all(select_query)
-        return [result._mapping["name"] for result in results]
+        categories = _vocabulary_cache.get("categories")
+        if categories is None:
+            select_query = select(category_tb.c.name)
+            results = await database.fetch_all(select_query)
+            categories = [result._mapping["name"] for result in results]
+            _vocabulary_cache.set("categories", categories)
+        return categories
+
+    @staticmethod
+    def invalidate_categories() -> None:
+        _vocabulary_cache.delete("categories")
 
     async def get_styles(self) -> list[str]:
         return [
@@ -236,18 +483,126 @@ class ProductRepo:
             "Sọc",
         ]
 
+    @memoized
     async def get_by_id_and_user_id(
         self, product_id: int, user_id: UUID
     ) -> ProductData | None:
         select_query = (
+            self.get_hydrate_query(user_id=user_id)
+            .where(product_tb.c.id == product_id)
+            .where(or_(product_tb.c.owner_id == user_id, product_tb.c.is_public))
+        )
+        result = await database.fetch_one(select_query)
+        return ProductData(**result._mapping) if result else None
+
+    async def get_by_ids_in_order(
+        self, ids: list[int], user_id: UUID | None = None
+    ) -> list[ProductData]:
+        """
+        Returns the visible products among `ids`, in the same order as `ids`.
+        """
+        if not ids:
+            return []
+
+        select_query = (
+            self.get_hydrate_query(user_id=user_id)
+            .where(product_tb.c.id.in_(ids))
+            .order_by(
+                func.array_position(
+                    literal(ids, type_=ARRAY(BigInteger)), product_tb.c.id
+                )
+            )
+        )
+        if user_id:
+            select_query = select_query.where(
+                or_(product_tb.c.owner_id == user_id, product_tb.c.is_public)
+            )
+        else:
+            select_query = select_query.where(product_tb.c.is_public)
+
+        results = await database.fetch_all(select_query)
+        return [ProductData(**result._mapping) for result in results]
+
+    async def get_public_page_by_ids_in_order(
+        self, ids: list[int], offset: int, size: int, user_id: UUID | None = None
+    ) -> tuple[list[ProductData], int]:
+        """
+        Pages through the public products among `ids`, in the same order as `ids`,
+        and counts them. Ids of products deleted or made private are skipped.
+        """
+        if not ids:
+            return [], 0
+
+        filter_clause = and_(product_tb.c.id.in_(ids), product_tb.c.is_public)
+        select_query = (
+            self.get_hydrate_query(user_id=user_id)
+            .where(filter_clause)
+            .order_by(
+                func.array_position(
+                    literal(ids, type_=ARRAY(BigInteger)), product_tb.c.id
+                )
+            )
+            .offset(offset)
+            .limit(size)
+        )
+        count_query = select(func.count()).where(filter_clause)
+        results, total_rows = await asyncio.gather(
+            database.fetch_all(select_query), database.fetch_val(count_query)
+        )
+        return [ProductData(**result._mapping) for result in results], total_rows
+
+    async def get_popular_similar_product_ids(
+        self,
+        styles: list[str],
+        patterns: list[str],
+        exclude_ids: list[int],
+        size: int,
+    ) -> list[int]:
+        """
+        Ranks public products by how many of the given styles/patterns they share,
+        then by their average rating. Used when the recommendation model is down.
+        """
+        avg_rating = (
             select(
-                product_tb,
-                func.array_agg(category_tb.c.name).label("categories"),
-                product_rating_tb.c.score.label("my_rating_score"),
+                product_rating_tb.c.product_id,
+                func.avg(product_rating_tb.c.score).label("avg_score"),
             )
+            .group_by(product_rating_tb.c.product_id)
+            .subquery()
+        )
+        similarity = literal(0)
+        if styles:
+            similarity += case((product_tb.c.style.in_(styles), 1), else_=0)
+        if patterns:
+            similarity += case((product_tb.c.pattern.in_(patterns), 1), else_=0)
+
+        select_query = (
+            select(product_tb.c.id)
+            .join(
+                avg_rating,
+                isouter=True,
+                onclause=avg_rating.c.product_id == product_tb.c.id,
+            )
+            .where(product_tb.c.is_public)
+            .order_by(
+                similarity.desc(),
+                func.coalesce(avg_rating.c.avg_score, 0).desc(),
+                product_tb.c.id.desc(),
+            )
+            .limit(size)
+        )
+        if exclude_ids:
+            select_query = select_query.where(product_tb.c.id.not_in(exclude_ids))
+
+        results = await database.fetch_all(select_query)
+        return [result._mapping["id"] for result in results]
+
+    async def get_product_version(
+        self, product_id: int, user_id: UUID
+    ) -> ResourceVersion | None:
+        select_query = (
+            select(product_tb.c.updated_at, product_rating_tb.c.score)
             .select_from(product_tb)
-            .join(product_category_tb, isouter=True)
-            .join(category_tb, isouter=True)
             .join(
                 product_rating_tb,
                 isouter=True,
@@ -256,14 +611,68 @@ class ProductRepo:
                     product_rating_tb.c.user_id == user_id,
                 ),
             )
-            .group_by(product_tb.c.id, product_rating_tb.c.score)
+            .where(product_tb.c.id == product_id)
+            .where(or_(product_tb.c.owner_id == user_id, product_tb.c.is_public))
+        )
+        result = await database.fetch_one(select_query)
+        if not result:
+            return None
+
+        # No Last-Modified: rating the product doesn't touch product.updated_at, so
+        # only the ETag can tell the caller's rating has changed
+        return ResourceVersion.from_validators(
+            None, result._mapping["updated_at"], product_id, result._mapping["score"]
         )
-        select_query = select_query.where(product_tb.c.id == product_id).where(
-            or_(product_tb.c.owner_id == user_id, product_tb.c.is_public)
+
+    async def get_product_reviews_version(
+        self, product_id: int, user_id: UUID
+    ) -> ResourceVersion | None:
+        select_query = (
+            select(
+                func.max(product_review_tb.c.updated_at).label("last_modified"),
+                func.count(product_review_tb.c.id).label("total_reviews"),
+                func.max(user_tb.c.updated_at).label("authors_last_modified"),
+                func.array_agg(
+                    aggregate_order_by(
+                        product_rating_tb.c.score, product_review_tb.c.id
+                    )
+                ).label("rating_scores"),
+            )
+            .select_from(product_tb)
+            .join(product_review_tb, isouter=True)
+            .join(
+                user_tb,
+                isouter=True,
+                onclause=user_tb.c.id == product_review_tb.c.user_id,
+            )
+            .join(
+                product_rating_tb,
+                isouter=True,
+                onclause=and_(
+                    product_review_tb.c.product_id == product_rating_tb.c.product_id,
+                    product_review_tb.c.user_id == product_rating_tb.c.user_id,
+                ),
+            )
+            .where(product_tb.c.id == product_id)
+            .where(or_(product_tb.c.owner_id == user_id, product_tb.c.is_public))
+            .group_by(product_tb.c.id)
         )
         result = await database.fetch_one(select_query)
-        return ProductData(**result._mapping) if result else None
+        if not result:
+            return None
+
+        # No Last-Modified: deleting the newest review moves it backwards and
+        # rating changes don't move it at all
+        return ResourceVersion.from_validators(
+            None,
+            result._mapping["last_modified"],
+            product_id,
+            result._mapping["total_reviews"],
+            result._mapping["authors_last_modified"],
+            result._mapping["rating_scores"],
+        )
 
+    @memoized
     async def get_product_rating(
         self, user_id: UUID, product_id: int
     ) -> ProductRatingData | None:
@@ -276,6 +685,7 @@ class ProductRepo:
         result = await database.fetch_one(select_query)
         return ProductRatingData(**result._mapping) if result else None
 
+    @memoized
     async def get_product_reviews(self, product_id: int) -> list[ProductReviewData]:
         select_query = (
             select(
@@ -316,6 +726,7 @@ class ProductRepo:
             for result in results
         ]
 
+    @memoized
     async def get_product_review(
         self, user_id: UUID, product_id: int
     ) -> ProductReviewData | None:
@@ -351,13 +762,17 @@ class ProductRepo:
             else None
         )
 
+    @invalidates
     async def create_product(self, create_data: ProductCreate) -> ProductData:
         insert_query = (
-            product_tb.insert().values(create_data.dict()).returning(product_tb)
+            product_tb.insert()
+            .values(create_data.dict())
+            .returning(*product_data_columns)
         )
         result = await database.fetch_one(insert_query)
         return ProductData(**result._mapping)  # type: ignore
 
+    @invalidates
     async def create_product_rating(
         self, user_id: UUID, product_id: int, score: float
     ) -> ProductRatingData:
@@ -369,6 +784,7 @@ class ProductRepo:
         result = await database.fetch_one(insert_query)
         return ProductRatingData(**result._mapping)  # type: ignore
 
+    @invalidates
     async def create_product_review(
         self, create_data: ProductReviewCreate
     ) -> ProductReviewData:
@@ -380,18 +796,65 @@ class ProductRepo:
         result = await database.fetch_one(insert_query)
         return ProductReviewData(**result._mapping)  # type: ignore
 
+    async def set_product_categories(
+        self, product_id: int, categories: list[str]
+    ) -> None:
+        delete_query = product_category_tb.delete().where(
+            product_category_tb.c.product_id == product_id
+        )
+        insert_query = insert(product_category_tb).from_select(
+            ["product_id", "category_id"],
+            select(literal(product_id), category_tb.c.id).where(
+                category_tb.c.name.in_(categories)
+            ),
+        )
+        await database.execute(delete_query)
+        if categories:
+            await database.execute(insert_query)
+
+    async def delete_product_embedding_if_images_changed(
+        self, product_id: int, image_urls: list[str]
+    ) -> None:
+        delete_query = product_embedding_tb.delete().where(
+            product_embedding_tb.c.product_id == product_id,
+            exists().where(
+                product_tb.c.id == product_id,
+                product_tb.c.image_urls.is_distinct_from(image_urls),
+            ),
+        )
+        await database.execute(delete_query)
+
+    @invalidates
     async def update_product(
         self, product_id: int, update_data: ProductUpdate
     ) -> ProductData:
-        update_query = (
-            product_tb.update()
-            .where(product_tb.c.id == product_id)
-            .values(update_data.dict(exclude_unset=True))
-            .returning(product_tb)
-        )
-        result = await database.fetch_one(update_query)
+        async with database.transaction():
+            # product.category_names is refreshed from product_category by trigger
+            if "categories" in update_data.__fields_set__:
+                await self.set_product_categories(
+                    product_id=product_id, categories=update_data.categories or []
+                )
+            # A stale embedding would outlive a skipped or failed re-embedding,
+            # without it the product is embedded on demand instead
+            if "image_urls" in update_data.__fields_set__:
+                await self.delete_product_embedding_if_images_changed(
+                    product_id=product_id, image_urls=update_data.image_urls or []
+                )
+
+            update_query = (
+                product_tb.update()
+                .where(product_tb.c.id == product_id)
+                .values(
+                    update_data.dict(exclude_unset=True, exclude={"categories"})
+                    or {"updated_at": func.now()}
+                )
+                .returning(*product_data_columns)
+            )
+            result = await database.fetch_one(update_query)
+        await recommendation_cache.invalidate_products([product_id])
         return ProductData(**result._mapping)  # type: ignore
 
+    @invalidates
     async def update_product_rating(
         self, user_id: UUID, product_id: int, score: float
     ) -> ProductRatingData:
@@ -409,6 +872,7 @@ class ProductRepo:
         result = await database.fetch_one(update_query)
         return ProductRatingData(**result._mapping)  # type: ignore
 
+    @invalidates
     async def update_product_review(
         self, user_id: UUID, product_id: int, update_data: ProductReviewUpdate
     ) -> ProductReviewData:
@@ -426,6 +890,7 @@ class ProductRepo:
         result = await database.fetch_one(update_query)
         return ProductReviewData(**result._mapping)  # type: ignore
 
+    @invalidates
     async def delete_product_rating(self, user_id: UUID, product_id: int) -> None:
         delete_query = product_rating_tb.delete().where(
             and_(
@@ -435,6 +900,7 @@ class ProductRepo:
         )
         await database.execute(delete_query)
 
+    @invalidates
     async def delete_product_review(self, user_id: UUID, product_id: int) -> None:
         delete_query = product_review_tb.delete().where(
             and_(
@@ -1,16 +1,23 @@
-from fastapi import APIRouter, Body, Depends, Query, status
+from uuid import UUID
+
+from fastapi import APIRouter, Body, Depends, Query, Request, Response, status
 
 from src.auth.dependencies import valid_jwt_token, valid_user
 from src.auth.schemas import JWTData
 from src.closet.dependencies import get_closet_service
 from src.closet.service import ClosetService
+from src.product.constants import FilterMode, PaginationMode, SearchMode
 from src.product.dependencies import (
     get_product_service,
     valid_product_create,
     valid_product_id,
     valid_product_review,
 )
-from src.product.exceptions import AlreadyReviewedProduct, ProductNotRatedYet
+from src.product.exceptions import (
+    AlreadyReviewedProduct,
+    ProductNotRatedYet,
+    ProductPermissionDenied,
+)
 from src.product.schemas import (
     FilterOptions,
     ProductCreate,
@@ -22,6 +29,11 @@ from src.product.schemas import (
     ProductUpdate,
 )
 from src.product.service import ProductService
+from src.recommendation.config import settings as recommendation_settings
+from src.recommendation.exceptions import RecommendationJobNotFound
+from src.recommendation.jobs import recommendation_jobs
+from src.recommendation.schemas import RecommendationJob, RecommendationJobPayload
+from src.responses import get_validator_headers, is_not_modified, not_modified_response
 from src.user.schemas import UserData
 
 router = APIRouter(prefix="/products", tags=["Products"])
@@ -41,6 +53,10 @@ async def get_products(
     styles: list[str] = Query(default=[]),
     patterns: list[str] = Query(default=[]),
     search_keyword: str | None = None,
+    search_mode: SearchMode = SearchMode.FULL_TEXT,
+    filter_mode: FilterMode = FilterMode.EXACT,
+    pagination_mode: PaginationMode = PaginationMode.OFFSET,
+    cursor: str | None = None,
     size: int = Query(default=20, ge=1),
     offset: int = Query(default=0, ge=0),
     service: ProductService = Depends(get_product_service),
@@ -50,6 +66,10 @@ async def get_products(
         styles=styles,
         patterns=patterns,
         search_keyword=search_keyword,
+        search_mode=search_mode,
+        filter_mode=filter_mode,
+        pagination_mode=pagination_mode,
+        cursor=cursor,
         size=size,
         offset=offset,
     )
@@ -61,6 +81,10 @@ async def get_my_products(
     styles: list[str] = Query(default=[]),
     patterns: list[str] = Query(default=[]),
     search_keyword: str | None = None,
+    search_mode: SearchMode = SearchMode.FULL_TEXT,
+    filter_mode: FilterMode = FilterMode.EXACT,
+    pagination_mode: PaginationMode = PaginationMode.OFFSET,
+    cursor: str | None = None,
     size: int = Query(default=20, ge=1),
     offset: int = Query(default=0, ge=0),
     jwt_data: JWTData = Depends(valid_jwt_token),
@@ -72,6 +96,10 @@ async def get_my_products(
         styles=styles,
         patterns=patterns,
         search_keyword=search_keyword,
+        search_mode=search_mode,
+        filter_mode=filter_mode,
+        pagination_mode=pagination_mode,
+        cursor=cursor,
         size=size,
         offset=offset,
     )
@@ -81,6 +109,7 @@ async def get_my_products(
 async def get_ai_recommended_products(
     include_public_products: bool = False,
     size: int = Query(default=20, ge=1),
+    offset: int = Query(default=0, ge=0),
     jwt_data: JWTData = Depends(valid_jwt_token),
     service: ProductService = Depends(get_product_service),
     closet_service: ClosetService = Depends(get_closet_service),
@@ -90,22 +119,90 @@ async def get_ai_recommended_products(
         closet=closet,
         include_public_products=include_public_products,
         size=size,
+        offset=offset,
+    )
+
+
+@router.post(
+    "/recommendation/jobs",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model_exclude_unset=True,
+)
+async def create_ai_recommendation_job(
+    include_public_products: bool = False,
+    size: int = Query(default=20, ge=1),
+    offset: int = Query(default=0, ge=0),
+    jwt_data: JWTData = Depends(valid_jwt_token),
+) -> RecommendationJob:
+    return await recommendation_jobs.submit(
+        RecommendationJobPayload(
+            owner_id=jwt_data.user_id,
+            include_public_products=include_public_products,
+            size=size,
+            offset=offset,
+        )
+    )
+
+
+@router.get("/recommendation/jobs/{job_id}", response_model_exclude_unset=True)
+async def get_ai_recommendation_job(
+    job_id: UUID,
+    wait: float = Query(
+        default=0, ge=0, le=recommendation_settings.RECOMMENDATION_JOB_MAX_WAIT_SECONDS
+    ),
+    jwt_data: JWTData = Depends(valid_jwt_token),
+) -> RecommendationJob:
+    job = await recommendation_jobs.get(
+        job_id=job_id, owner_id=jwt_data.user_id, wait=wait
     )
+    if not job:
+        raise RecommendationJobNotFound()
+
+    return job
 
 
-@router.get("/filter-options")
+@router.get("/filter-options", response_model=FilterOptions)
 async def get_filter_options(
+    request: Request,
     jwt_data: JWTData = Depends(valid_jwt_token),
     service: ProductService = Depends(get_product_service),
-) -> FilterOptions:
-    categories = await service.get_categories()
-    styles = await service.get_styles()
-    patterns = await service.get_patterns()
-    return FilterOptions(categories=categories, styles=styles, patterns=patterns)
+) -> Response:
+    content, etag = await service.get_serialized_filter_options()
+    if is_not_modified(request, etag=etag):
+        return not_modified_response(etag=etag)
+
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers=get_validator_headers(etag=etag),
+    )
 
 
 @router.get("/{product_id}")
-async def get_product(product: ProductData = Depends(valid_product_id)) -> ProductData:
+async def get_product(
+    product_id: int,
+    request: Request,
+    response: Response,
+    jwt_data: JWTData = Depends(valid_jwt_token),
+    service: ProductService = Depends(get_product_service),
+) -> ProductData:
+    # Validators are checked before the full product row is read and parsed
+    version = await service.get_product_version(
+        product_id=product_id, user_id=jwt_data.user_id
+    )
+    if not version:
+        raise ProductPermissionDenied()
+    if is_not_modified(request, etag=version.etag, last_modified=version.last_modified):
+        return not_modified_response(
+            etag=version.etag, last_modified=version.last_modified
+        )
+
+    product = await service.get_product(product_id=product_id, user_id=jwt_data.user_id)
+    if not product:
+        raise ProductPermissionDenied()
+    response.headers.update(
+        get_validator_headers(etag=version.etag, last_modified=version.last_modified)
+    )
     return product
 
 
@@ -160,10 +257,26 @@ async def review_product(
 
 @router.get("/{product_id}/reviews", response_model_exclude_unset=True)
 async def get_product_reviews(
-    product: ProductData = Depends(valid_product_id),
+    product_id: int,
+    request: Request,
+    response: Response,
+    jwt_data: JWTData = Depends(valid_jwt_token),
     service: ProductService = Depends(get_product_service),
 ) -> list[ProductReviewData]:
-    return await service.get_product_reviews(product_id=product.id)
+    version = await service.get_product_reviews_version(
+        product_id=product_id, user_id=jwt_data.user_id
+    )
+    if not version:
+        raise ProductPermissionDenied()
+    if is_not_modified(request, etag=version.etag, last_modified=version.last_modified):
+        return not_modified_response(
+            etag=version.etag, last_modified=version.last_modified
+        )
+
+    response.headers.update(
+        get_validator_headers(etag=version.etag, last_modified=version.last_modified)
+    )
+    return await service.get_product_reviews(product_id=product_id)
 
 
 @router.get("/{product_id}/reviews/me", response_model_exclude={"author"})
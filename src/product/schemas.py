@@ -40,7 +40,9 @@ class ProductData(BaseModel):
 
 class ProductDatas(BaseModel):
     products: list[ProductData]
-    total_rows: int
+    total_rows: int | None
+    is_total_rows_exact: bool | None
+    next_cursor: str | None
 
 
 class ProductCreate(BaseModel):
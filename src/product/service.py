@@ -1,12 +1,16 @@
+import asyncio
 from uuid import UUID
 
-import httpx
-
+from src.cache import TTLCache
 from src.closet.repository import ClosetRepo
 from src.closet.schemas import ClosetData
-from src.config import settings
+from src.closet.service import ClosetService
+from src.exceptions import ServiceUnavailable
+from src.product.config import settings as product_settings
+from src.product.constants import FilterMode, PaginationMode, SearchMode
 from src.product.repository import ProductRepo
 from src.product.schemas import (
+    FilterOptions,
     ProductCreate,
     ProductData,
     ProductDatas,
@@ -15,13 +19,36 @@ from src.product.schemas import (
     ProductReviewUpdate,
     ProductUpdate,
 )
+from src.product.utils import match_vocabulary
+from src.recommendation.cache import RecommendationCache, recommendation_cache
+from src.recommendation.client import recommendation_client
+from src.recommendation.config import settings as recommendation_settings
+from src.recommendation.index import vector_index
+from src.recommendation.ingestion import embedding_pipeline
+from src.recommendation.repository import RecommendationRepo
+from src.recommendation.schemas import RecommendationJobPayload
+from src.recommendation.service import RecommendationService
+from src.responses import make_etag
+from src.schemas import ResourceVersion
 from src.user.schemas import UserData
 
+_filter_options_cache: TTLCache[str, tuple[bytes, str]] = TTLCache(
+    maxsize=1, ttl=product_settings.PRODUCT_VOCABULARY_CACHE_TTL_SECONDS
+)
+
 
 class ProductService:
-    def __init__(self, product_repo: ProductRepo, closet_repo: ClosetRepo):
+    def __init__(
+        self,
+        product_repo: ProductRepo,
+        closet_repo: ClosetRepo,
+        recommendation_service: RecommendationService,
+        recommendation_cache: RecommendationCache,
+    ):
         self.product_repo = product_repo
         self.closet_repo = closet_repo
+        self.recommendation_service = recommendation_service
+        self.recommendation_cache = recommendation_cache
 
     async def create_product(self, create_data: ProductCreate) -> ProductData:
         new_product = await self.product_repo.create_product(create_data)
@@ -29,14 +56,27 @@ class ProductService:
         await self.closet_repo.create_closet_items(
             closet_id=closet.id, product_ids=[new_product.id]
         )
+        await embedding_pipeline.submit(
+            product_id=new_product.id, image_urls=new_product.image_urls
+        )
         return new_product
 
     async def update_product(
         self, product: ProductData, update_data: ProductUpdate
     ) -> ProductData:
-        return await self.product_repo.update_product(
+        updated_product = await self.product_repo.update_product(
             product_id=product.id, update_data=update_data
         )
+        if "categories" in update_data.__fields_set__:
+            self.invalidate_filter_options()
+        # The old embedding is dropped with the update, there is nothing to embed
+        # when the images are removed
+        image_urls = updated_product.image_urls
+        if image_urls and image_urls != product.image_urls:
+            await embedding_pipeline.submit(
+                product_id=updated_product.id, image_urls=image_urls
+            )
+        return updated_product
 
     async def get_products(
         self,
@@ -46,9 +86,21 @@ class ProductService:
         styles: list[str] | None = None,
         patterns: list[str] | None = None,
         search_keyword: str | None = None,
+        search_mode: SearchMode = SearchMode.FULL_TEXT,
+        filter_mode: FilterMode = FilterMode.EXACT,
+        pagination_mode: PaginationMode = PaginationMode.OFFSET,
+        cursor: str | None = None,
         size: int = 20,
         offset: int = 0,
     ) -> ProductDatas:
+        if filter_mode == FilterMode.EXACT:
+            if categories:
+                categories = match_vocabulary(categories, await self.get_categories())
+            if styles:
+                styles = match_vocabulary(styles, await self.get_styles())
+            if patterns:
+                patterns = match_vocabulary(patterns, await self.get_patterns())
+
         return await self.product_repo.get_multi(
             ids=ids,
             owner_id=owner_id,
@@ -56,6 +108,10 @@ class ProductService:
             styles=styles,
             patterns=patterns,
             search_keyword=search_keyword,
+            search_mode=search_mode,
+            filter_mode=filter_mode,
+            pagination_mode=pagination_mode,
+            cursor=cursor,
             size=size,
             offset=offset,
         )
@@ -67,15 +123,23 @@ class ProductService:
         styles: list[str] | None = None,
         patterns: list[str] | None = None,
         search_keyword: str | None = None,
+        search_mode: SearchMode = SearchMode.FULL_TEXT,
+        filter_mode: FilterMode = FilterMode.EXACT,
+        pagination_mode: PaginationMode = PaginationMode.OFFSET,
+        cursor: str | None = None,
         size: int = 20,
         offset: int = 0,
     ) -> ProductDatas:
-        return await self.product_repo.get_multi(
+        return await self.get_products(
             owner_id=owner_id,
             categories=categories,
             styles=styles,
             patterns=patterns,
             search_keyword=search_keyword,
+            search_mode=search_mode,
+            filter_mode=filter_mode,
+            pagination_mode=pagination_mode,
+            cursor=cursor,
             size=size,
             offset=offset,
         )
@@ -85,6 +149,7 @@ class ProductService:
         closet: ClosetData,
         include_public_products: bool,
         size: int,
+        offset: int = 0,
     ) -> ProductDatas:
         if include_public_products:
             referenced_products = [*closet.owned_products, *closet.public_products]
@@ -92,25 +157,63 @@ class ProductService:
             referenced_products = closet.owned_products
 
         if not referenced_products:
-            return ProductDatas(products=[], total_rows=0)
+            return ProductDatas(products=[], total_rows=0, is_total_rows_exact=True)
 
         referenced_product_img_urls = []
         for product in referenced_products:
             referenced_product_img_urls.extend(product.image_urls)
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url=f"{settings.AI_MODEL_URL}/recommendation",
-                json={
-                    "image_urls": referenced_product_img_urls,
-                    "num_of_recommended_products": size,
-                },
-                timeout=None,
-            )
-            recommended_product_ids = response.json()
-        results = await self.get_products(ids=recommended_product_ids, size=size)
-        results.total_rows = 20
-        return results
+        # A whole candidate list is ranked and cached at once, so paging through it
+        # doesn't call the model again
+        candidates_size = max(
+            recommendation_settings.RECOMMENDATION_CANDIDATES_SIZE, offset + size
+        )
+        cache_key = self.recommendation_cache.make_key(
+            image_urls=referenced_product_img_urls,
+            include_public_products=include_public_products,
+            size=candidates_size,
+        )
+        recommended_product_ids = await self.recommendation_cache.get(cache_key)
+        if recommended_product_ids is None:
+            try:
+                recommended_product_ids = (
+                    await self.recommendation_service.get_recommended_product_ids(
+                        referenced_products=referenced_products, size=candidates_size
+                    )
+                )
+            except ServiceUnavailable:
+                # Fallback results aren't cached so the model is used again as soon
+                # as it recovers
+                recommended_product_ids = (
+                    await self.product_repo.get_popular_similar_product_ids(
+                        styles=list({p.style for p in referenced_products if p.style}),
+                        patterns=list(
+                            {p.pattern for p in referenced_products if p.pattern}
+                        ),
+                        exclude_ids=[product.id for product in referenced_products],
+                        size=candidates_size,
+                    )
+                )
+            else:
+                await self.recommendation_cache.set(
+                    cache_key,
+                    product_ids=recommended_product_ids,
+                    referenced_product_ids={
+                        product.id for product in referenced_products
+                    },
+                )
+
+        # Only public products are recommended, the candidates are filtered before
+        # paging and counting since they may be deleted or made private since ranked
+        products, total_rows = await self.product_repo.get_public_page_by_ids_in_order(
+            ids=recommended_product_ids,
+            offset=offset,
+            size=size,
+            user_id=closet.owner_id,
+        )
+        return ProductDatas(
+            products=products, total_rows=total_rows, is_total_rows_exact=True
+        )
 
     async def get_categories(self) -> list[str]:
         return await self.product_repo.get_categories()
@@ -121,6 +224,32 @@ class ProductService:
     async def get_patterns(self) -> list[str]:
         return await self.product_repo.get_patterns()
 
+    async def get_filter_options(self) -> FilterOptions:
+        categories, styles, patterns = await asyncio.gather(
+            self.get_categories(), self.get_styles(), self.get_patterns()
+        )
+        return FilterOptions(categories=categories, styles=styles, patterns=patterns)
+
+    async def get_serialized_filter_options(self) -> tuple[bytes, str]:
+        """
+        Returns the JSON body of the filter options together with its ETag.
+        """
+        serialized_filter_options = _filter_options_cache.get("filter_options")
+        if serialized_filter_options is None:
+            filter_options = await self.get_filter_options()
+            content = filter_options.json(by_alias=True).encode()
+            serialized_filter_options = content, make_etag(content)
+            _filter_options_cache.set("filter_options", serialized_filter_options)
+        return serialized_filter_options
+
+    def invalidate_filter_options(self) -> None:
+        """
+        Drops this process' cached vocabularies, other workers pick up changes when
+        their TTL runs out.
+        """
+        self.product_repo.invalidate_categories()
+        _filter_options_cache.clear()
+
     async def rate_product(
         self, user_id: UUID, product: ProductData, score: float
     ) -> ProductData:
@@ -145,6 +274,25 @@ class ProductService:
             user_id=user_id, product_id=product_id
         )
 
+    async def get_product(self, product_id: int, user_id: UUID) -> ProductData | None:
+        return await self.product_repo.get_by_id_and_user_id(
+            product_id=product_id, user_id=user_id
+        )
+
+    async def get_product_version(
+        self, product_id: int, user_id: UUID
+    ) -> ResourceVersion | None:
+        return await self.product_repo.get_product_version(
+            product_id=product_id, user_id=user_id
+        )
+
+    async def get_product_reviews_version(
+        self, product_id: int, user_id: UUID
+    ) -> ResourceVersion | None:
+        return await self.product_repo.get_product_reviews_version(
+            product_id=product_id, user_id=user_id
+        )
+
     async def get_product_reviews(self, product_id: int) -> list[ProductReviewData]:
         return await self.product_repo.get_product_reviews(product_id)
 
@@ -178,3 +326,25 @@ class ProductService:
         await self.product_repo.delete_product_review(
             user_id=user_id, product_id=product_id
         )
+
+
+async def run_recommendation_job(payload: RecommendationJobPayload) -> ProductDatas:
+    product_repo, closet_repo = ProductRepo(), ClosetRepo()
+    closet_service = ClosetService(closet_repo, product_repo)
+    service = ProductService(
+        product_repo=product_repo,
+        closet_repo=closet_repo,
+        recommendation_service=RecommendationService(
+            recommendation_repo=RecommendationRepo(),
+            recommendation_client=recommendation_client,
+            vector_index=vector_index,
+        ),
+        recommendation_cache=recommendation_cache,
+    )
+    closet = await closet_service.get_closet(owner_id=payload.owner_id)
+    return await service.get_recommendations(
+        closet=closet,
+        include_public_products=payload.include_public_products,
+        size=payload.size,
+        offset=payload.offset,
+    )
@@ -3,18 +3,31 @@ from sqlalchemy import (
     BigInteger,
     Boolean,
     Column,
+    Computed,
     DateTime,
     Float,
     ForeignKey,
     Identity,
+    Index,
     Integer,
     String,
     Table,
     UniqueConstraint,
     func,
 )
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import TSVECTOR
 
 from src.database import metadata
+from src.product.constants import SEARCH_TS_CONFIG
+
+PRODUCT_SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_TS_CONFIG}', coalesce(name, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_TS_CONFIG}', coalesce(brand, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_TS_CONFIG}', coalesce(style, '')), 'C') || "
+    f"setweight(to_tsvector('{SEARCH_TS_CONFIG}', coalesce(pattern, '')), 'C') || "
+    f"setweight(to_tsvector('{SEARCH_TS_CONFIG}', coalesce(description, '')), 'D')"
+)
 
 product_tb = Table(
     "product",
@@ -48,13 +61,53 @@ product_tb = Table(
         server_default=func.now(),
         onupdate=func.now(),
     ),
+    # Kept in sync with product_category/category by database triggers
+    Column(
+        "category_names",
+        postgresql.ARRAY(String),
+        server_default="{}",
+        nullable=False,
+    ),
+    Column(
+        "search_vector",
+        TSVECTOR,
+        Computed(PRODUCT_SEARCH_VECTOR_EXPRESSION, persisted=True),
+    ),
+    Index("product_search_vector_idx", "search_vector", postgresql_using="gin"),
+    Index("product_category_names_idx", "category_names", postgresql_using="gin"),
+    Index("product_created_at_id_idx", "created_at", "id"),
+    Index("product_style_idx", "style"),
+    Index("product_pattern_idx", "pattern"),
+    Index(
+        "product_style_trgm_idx",
+        "style",
+        postgresql_using="gin",
+        postgresql_ops={"style": "gin_trgm_ops"},
+    ),
+    Index(
+        "product_pattern_trgm_idx",
+        "pattern",
+        postgresql_using="gin",
+        postgresql_ops={"pattern": "gin_trgm_ops"},
+    ),
 )
 
+# Columns backing `ProductData`: internal columns are left out and the
+# denormalized category names are exposed as `categories`
+product_data_columns = [
+    *[
+        column
+        for column in product_tb.c
+        if column.name not in ("search_vector", "category_names")
+    ],
+    product_tb.c.category_names.label("categories"),
+]
+
 category_tb = Table(
     "category",
     metadata,
     Column("id", Integer, Identity(), primary_key=True),
-    Column("name", String, nullable=False),
+    Column("name", String, nullable=False, index=True),
     Column("display_name", String, nullable=False),
     Column("created_at", DateTime(timezone=True), server_default=func.now()),
     Column(
@@ -63,6 +116,12 @@ category_tb = Table(
         server_default=func.now(),
         onupdate=func.now(),
     ),
+    Index(
+        "category_name_trgm_idx",
+        "name",
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    ),
 )
 
 product_category_tb = Table(
@@ -130,3 +189,21 @@ product_review_tb = Table(
     ),
     UniqueConstraint("product_id", "user_id"),
 )
+
+product_embedding_tb = Table(
+    "product_embedding",
+    metadata,
+    Column(
+        "product_id",
+        ForeignKey("product.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column("embedding", postgresql.ARRAY(postgresql.REAL), nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column(
+        "updated_at",
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    ),
+)
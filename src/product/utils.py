@@ -0,0 +1,39 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Any
+
+import orjson
+
+from src.product.constants import CursorKey
+from src.product.exceptions import InvalidCursor
+
+
+def encode_cursor(key: CursorKey, sort_value: datetime | float, product_id: int) -> str:
+    payload = orjson.dumps({"k": key, "v": sort_value, "id": product_id})
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key: CursorKey) -> tuple[datetime | float, int]:
+    try:
+        padded_cursor = cursor + "=" * (-len(cursor) % 4)
+        payload: dict[str, Any] = orjson.loads(base64.urlsafe_b64decode(padded_cursor))
+        if payload["k"] != key:
+            raise InvalidCursor()
+
+        if key == CursorKey.CREATED_AT:
+            sort_value = datetime.fromisoformat(payload["v"])
+        else:
+            sort_value = float(payload["v"])
+        return sort_value, int(payload["id"])
+    except (binascii.Error, orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+        raise InvalidCursor()
+
+
+def match_vocabulary(values: list[str], vocabulary: list[str]) -> list[str]:
+    """
+    Maps filter values onto their canonical spelling in the vocabulary, ignoring
+    case, so they can be matched exactly. Unknown values are kept as they are.
+    """
+    canonical_values = {term.casefold(): term for term in vocabulary}
+    return [canonical_values.get(value.casefold(), value) for value in values]
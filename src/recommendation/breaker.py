@@ -0,0 +1,123 @@
+import time
+from collections import deque
+from datetime import datetime
+from typing import Awaitable, Callable, TypeVar
+
+from src.recommendation.constants import CircuitState
+from src.recommendation.exceptions import RecommendationCircuitOpen
+from src.recommendation.schemas import CircuitBreakerMetrics
+from src.utils import utc_now
+
+T = TypeVar("T")
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing dependency for `recovery_timeout` seconds once
+    `failure_threshold` calls in a row have failed. Afterwards a single probe call
+    is let through: the circuit closes again if it succeeds and re-opens otherwise.
+
+    Only exceptions `is_failure` accepts count as failures, others (e.g. errors
+    caused by the request itself) prove the dependency is up.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        recovery_timeout: float,
+        latency_window: int = 200,
+        is_failure: Callable[[Exception], bool] = lambda exc: True,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.is_failure = is_failure
+        self._state = CircuitState.CLOSED
+        self._opened_at: float | None = None
+        self._opened_at_datetime: datetime | None = None
+        self._probe_in_flight = False
+        self._consecutive_failures = 0
+        self._total_calls = 0
+        self._total_failures = 0
+        self._total_rejections = 0
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+
+    @property
+    def state(self) -> CircuitState:
+        if (
+            self._state == CircuitState.OPEN
+            and self._opened_at is not None
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+        return self._state
+
+    async def call(self, func: Callable[[], Awaitable[T]]) -> T:
+        state = self.state
+        if state == CircuitState.OPEN or (
+            state == CircuitState.HALF_OPEN and self._probe_in_flight
+        ):
+            self._total_rejections += 1
+            raise RecommendationCircuitOpen()
+
+        is_probe = state == CircuitState.HALF_OPEN
+        if is_probe:
+            self._probe_in_flight = True
+
+        self._total_calls += 1
+        started_at = time.monotonic()
+        try:
+            result = await func()
+        except Exception as exc:
+            self._latencies.append(time.monotonic() - started_at)
+            if self.is_failure(exc):
+                self._record_failure()
+            else:
+                self._record_success()
+            raise
+        finally:
+            if is_probe:
+                self._probe_in_flight = False
+
+        self._latencies.append(time.monotonic() - started_at)
+        self._record_success()
+        return result
+
+    def _record_success(self) -> None:
+        self._consecutive_failures = 0
+        self._state = CircuitState.CLOSED
+        self._opened_at = self._opened_at_datetime = None
+
+    def _record_failure(self) -> None:
+        self._total_failures += 1
+        self._consecutive_failures += 1
+        if (
+            self._state == CircuitState.HALF_OPEN
+            or self._consecutive_failures >= self.failure_threshold
+        ):
+            self._state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+            self._opened_at_datetime = utc_now()
+
+    def get_metrics(self) -> CircuitBreakerMetrics:
+        latencies = sorted(self._latencies)
+
+        def percentile_ms(percent: float) -> float | None:
+            if not latencies:
+                return None
+            index = min(len(latencies) - 1, int(len(latencies) * percent))
+            return round(latencies[index] * 1000, 2)
+
+        return CircuitBreakerMetrics(
+            name=self.name,
+            state=self.state,
+            consecutive_failures=self._consecutive_failures,
+            total_calls=self._total_calls,
+            total_failures=self._total_failures,
+            total_rejections=self._total_rejections,
+            opened_at=self._opened_at_datetime,
+            latency_p50_ms=percentile_ms(0.5),
+            latency_p95_ms=percentile_ms(0.95),
+            latency_max_ms=percentile_ms(1),
+        )
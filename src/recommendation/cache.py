@@ -0,0 +1,97 @@
+import hashlib
+from abc import ABC, abstractmethod
+from typing import Iterable
+
+import orjson
+
+from src.cache import TTLCache
+from src.recommendation.config import settings
+
+
+class RecommendationCacheBackend(ABC):
+    """
+    Storage for recommended product ids. Implement it on top of a shared store
+    to reuse model results across processes.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> list[int] | None:
+        ...
+
+    @abstractmethod
+    async def set(
+        self, key: str, product_ids: list[int], referenced_product_ids: set[int]
+    ) -> None:
+        ...
+
+    @abstractmethod
+    async def invalidate_products(self, product_ids: Iterable[int]) -> None:
+        ...
+
+    @abstractmethod
+    async def clear(self) -> None:
+        ...
+
+
+class InMemoryRecommendationCacheBackend(RecommendationCacheBackend):
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache: TTLCache[str, tuple[list[int], frozenset[int]]] = TTLCache(
+            maxsize=maxsize, ttl=ttl
+        )
+
+    async def get(self, key: str) -> list[int] | None:
+        entry = self._cache.get(key)
+        return list(entry[0]) if entry else None
+
+    async def set(
+        self, key: str, product_ids: list[int], referenced_product_ids: set[int]
+    ) -> None:
+        self._cache.set(key, (list(product_ids), frozenset(referenced_product_ids)))
+
+    async def invalidate_products(self, product_ids: Iterable[int]) -> None:
+        product_ids = set(product_ids)
+        if not product_ids:
+            return
+
+        # The cache is bounded, so scanning it is cheaper than keeping a reverse
+        # index in sync with LRU evictions and expirations
+        for key, (_, referenced_product_ids) in self._cache.items():
+            if not referenced_product_ids.isdisjoint(product_ids):
+                self._cache.delete(key)
+
+    async def clear(self) -> None:
+        self._cache.clear()
+
+
+class RecommendationCache:
+    def __init__(self, backend: RecommendationCacheBackend):
+        self.backend = backend
+
+    @staticmethod
+    def make_key(
+        image_urls: Iterable[str], include_public_products: bool, size: int
+    ) -> str:
+        content = orjson.dumps([sorted(image_urls), include_public_products, size])
+        return hashlib.sha256(content).hexdigest()
+
+    async def get(self, key: str) -> list[int] | None:
+        return await self.backend.get(key)
+
+    async def set(
+        self, key: str, product_ids: list[int], referenced_product_ids: set[int]
+    ) -> None:
+        await self.backend.set(key, product_ids, referenced_product_ids)
+
+    async def invalidate_products(self, product_ids: Iterable[int]) -> None:
+        await self.backend.invalidate_products(product_ids)
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+
+recommendation_cache = RecommendationCache(
+    backend=InMemoryRecommendationCacheBackend(
+        maxsize=settings.RECOMMENDATION_CACHE_MAXSIZE,
+        ttl=settings.RECOMMENDATION_CACHE_TTL_SECONDS,
+    )
+)
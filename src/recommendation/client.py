@@ -0,0 +1,116 @@
+from typing import Any
+
+import httpx
+
+from src.config import settings as app_settings
+from src.recommendation.breaker import CircuitBreaker
+from src.recommendation.config import settings
+from src.recommendation.exceptions import (
+    RecommendationServiceBusy,
+    RecommendationServiceUnavailable,
+)
+
+RECOMMENDATION_URL = "/recommendation"
+EMBEDDINGS_URL = "/embeddings"
+
+
+def is_service_failure(exc: Exception) -> bool:
+    """
+    5xx responses, timeouts and connection errors count against the model service.
+    4xx responses are caused by the request, and pool timeouts by our own limits.
+    """
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, httpx.TransportError) and not isinstance(
+        exc, httpx.PoolTimeout
+    )
+
+
+class RecommendationClient:
+    """
+    Long-lived client for the AI model service. It is connected once in the app
+    lifespan so every request reuses the same keep-alive connection pool. The pool
+    size also bounds how many requests are in flight towards the model at once.
+
+    Each endpoint has its own circuit breaker, so failing background embedding
+    calls don't cut user-facing recommendations off.
+    """
+
+    def __init__(self, base_url: str = app_settings.AI_MODEL_URL):
+        self.base_url = base_url
+        self.breakers = {
+            url: CircuitBreaker(
+                name=url.strip("/"),
+                failure_threshold=settings.RECOMMENDATION_BREAKER_FAILURE_THRESHOLD,
+                recovery_timeout=(
+                    settings.RECOMMENDATION_BREAKER_RECOVERY_TIMEOUT_SECONDS
+                ),
+                latency_window=settings.RECOMMENDATION_BREAKER_LATENCY_WINDOW,
+                is_failure=is_service_failure,
+            )
+            for url in (RECOMMENDATION_URL, EMBEDDINGS_URL)
+        }
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise RuntimeError("RecommendationClient is not connected")
+        return self._client
+
+    async def connect(self) -> None:
+        if self._client is not None:
+            return
+
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=httpx.Timeout(
+                connect=settings.RECOMMENDATION_CONNECT_TIMEOUT_SECONDS,
+                read=settings.RECOMMENDATION_READ_TIMEOUT_SECONDS,
+                write=settings.RECOMMENDATION_WRITE_TIMEOUT_SECONDS,
+                pool=settings.RECOMMENDATION_POOL_TIMEOUT_SECONDS,
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.RECOMMENDATION_MAX_CONNECTIONS,
+                max_keepalive_connections=(
+                    settings.RECOMMENDATION_MAX_KEEPALIVE_CONNECTIONS
+                ),
+                keepalive_expiry=settings.RECOMMENDATION_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+
+    async def disconnect(self) -> None:
+        if self._client is None:
+            return
+
+        await self._client.aclose()
+        self._client = None
+
+    async def get_recommended_product_ids(
+        self, image_urls: list[str], size: int
+    ) -> list[int]:
+        return await self._post(
+            RECOMMENDATION_URL,
+            json={"image_urls": image_urls, "num_of_recommended_products": size},
+        )
+
+    async def get_image_embeddings(self, image_urls: list[str]) -> list[list[float]]:
+        return await self._post(EMBEDDINGS_URL, json={"image_urls": image_urls})
+
+    async def _post(self, url: str, json: dict) -> Any:
+        async def send() -> httpx.Response:
+            response = await self.client.post(url, json=json)
+            response.raise_for_status()
+            return response
+
+        try:
+            response = await self.breakers[url].call(send)
+        except httpx.PoolTimeout:
+            raise RecommendationServiceBusy()
+        except httpx.HTTPError:
+            raise RecommendationServiceUnavailable()
+
+        return response.json()
+
+
+recommendation_client = RecommendationClient()
@@ -0,0 +1,46 @@
+from pydantic import BaseSettings
+
+from src.recommendation.constants import JobBackendType
+
+
+class Settings(BaseSettings):
+    RECOMMENDATION_CONNECT_TIMEOUT_SECONDS: float = 3
+    RECOMMENDATION_READ_TIMEOUT_SECONDS: float = 20
+    RECOMMENDATION_WRITE_TIMEOUT_SECONDS: float = 5
+    RECOMMENDATION_POOL_TIMEOUT_SECONDS: float = 5
+
+    RECOMMENDATION_MAX_CONNECTIONS: int = 20
+    RECOMMENDATION_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    RECOMMENDATION_KEEPALIVE_EXPIRY_SECONDS: float = 60
+
+    RECOMMENDATION_BREAKER_FAILURE_THRESHOLD: int = 5
+    RECOMMENDATION_BREAKER_RECOVERY_TIMEOUT_SECONDS: float = 30
+    RECOMMENDATION_BREAKER_LATENCY_WINDOW: int = 200
+
+    RECOMMENDATION_CACHE_TTL_SECONDS: float = 60 * 60
+    RECOMMENDATION_CACHE_MAXSIZE: int = 1024
+    RECOMMENDATION_CANDIDATES_SIZE: int = 100
+
+    RECOMMENDATION_JOB_BACKEND: JobBackendType = JobBackendType.DATABASE
+    RECOMMENDATION_JOB_WORKERS: int = 4
+    RECOMMENDATION_JOB_QUEUE_MAXSIZE: int = 1000
+    RECOMMENDATION_JOB_TTL_SECONDS: float = 10 * 60
+    RECOMMENDATION_JOB_TIMEOUT_SECONDS: float = 2 * 60
+    RECOMMENDATION_JOB_MAX_WAIT_SECONDS: float = 30
+    RECOMMENDATION_JOB_POLL_INTERVAL_SECONDS: float = 1
+    RECOMMENDATION_JOB_WAIT_POLL_INTERVAL_SECONDS: float = 0.25
+    RECOMMENDATION_PRECOMPUTE_SIZE: int = 20
+
+    RECOMMENDATION_INDEX_DIR: str = "data/vector_index"
+    RECOMMENDATION_INDEX_KEPT_VERSIONS: int = 3
+
+    EMBEDDING_INGESTION_QUEUE_MAXSIZE: int = 1000
+    EMBEDDING_INGESTION_ENQUEUE_TIMEOUT_SECONDS: float = 1
+    EMBEDDING_INGESTION_BATCH_SIZE: int = 64
+    EMBEDDING_INGESTION_BATCH_MAX_WAIT_SECONDS: float = 2
+    EMBEDDING_INGESTION_MAX_RETRIES: int = 3
+    EMBEDDING_INGESTION_RETRY_BACKOFF_SECONDS: float = 1
+    EMBEDDING_INGESTION_REBUILD_DELAY_SECONDS: float = 30
+
+
+settings = Settings()
@@ -0,0 +1,16 @@
+from fastapi import Depends
+
+from src.recommendation.client import recommendation_client
+from src.recommendation.index import vector_index
+from src.recommendation.repository import RecommendationRepo
+from src.recommendation.service import RecommendationService
+
+
+async def get_recommendation_service(
+    recommendation_repo: RecommendationRepo = Depends(),
+) -> RecommendationService:
+    return RecommendationService(
+        recommendation_repo=recommendation_repo,
+        recommendation_client=recommendation_client,
+        vector_index=vector_index,
+    )
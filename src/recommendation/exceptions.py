@@ -0,0 +1,27 @@
+from src.exceptions import NotFound, ServiceUnavailable
+
+
+class RecommendationServiceUnavailable(ServiceUnavailable):
+    DETAIL = "The recommendation service is unavailable, please try again later!"
+
+
+class RecommendationCircuitOpen(RecommendationServiceUnavailable):
+    DETAIL = (
+        "The recommendation service is temporarily disabled after repeated failures!"
+    )
+
+
+class RecommendationServiceInvalidResponse(RecommendationServiceUnavailable):
+    DETAIL = "The recommendation service returned an invalid response!"
+
+
+class RecommendationServiceBusy(ServiceUnavailable):
+    DETAIL = "The recommendation service is busy, please try again later!"
+
+
+class RecommendationJobQueueFull(ServiceUnavailable):
+    DETAIL = "Too many pending recommendation jobs, please try again later!"
+
+
+class RecommendationJobNotFound(NotFound):
+    DETAIL = "The given recommendation job doesn't exist or has expired!"
@@ -0,0 +1,171 @@
+import fcntl
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Iterable, Sequence
+from uuid import uuid4
+
+import numpy as np
+import orjson
+
+from src.recommendation.config import settings
+
+
+class VectorIndex:
+    """
+    Brute-force cosine similarity index over product embeddings. Vectors are
+    normalized once when the index is built and memory-mapped from disk, so every
+    worker process shares the same pages and a search is a single matrix product.
+
+    Each build is written to its own version directory and published by atomically
+    repointing the `current` symlink. Readers keep mapping the version they loaded
+    until they notice the symlink has moved, so ids and vectors always come from
+    the same build.
+    """
+
+    IDS_FILE_NAME = "ids.npy"
+    VECTORS_FILE_NAME = "vectors.npy"
+    MANIFEST_FILE_NAME = "manifest.json"
+    CURRENT_LINK_NAME = "current"
+    LOCK_FILE_NAME = ".lock"
+    VERSIONS_DIR_NAME = "versions"
+
+    def __init__(self, directory: str, kept_versions: int):
+        self.directory = Path(directory)
+        self.kept_versions = kept_versions
+        self.version: str | None = None
+        self.source_version: str | None = None
+        # Ids and vectors are swapped as one tuple so a concurrent search never
+        # pairs arrays from different builds
+        self._arrays: tuple[np.ndarray, np.ndarray] | None = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self._arrays is not None and len(self._arrays[0]) > 0
+
+    @property
+    def dimension(self) -> int | None:
+        return self._arrays[1].shape[1] if self._arrays is not None else None
+
+    @property
+    def current_version(self) -> str | None:
+        try:
+            return os.readlink(self.directory / self.CURRENT_LINK_NAME)
+        except OSError:
+            return None
+
+    def load(self) -> bool:
+        version = self.current_version
+        if version is None:
+            return False
+
+        version_dir = self.directory / version
+        try:
+            ids = np.load(version_dir / self.IDS_FILE_NAME, mmap_mode="r")
+            vectors = np.load(version_dir / self.VECTORS_FILE_NAME, mmap_mode="r")
+            manifest = orjson.loads(
+                (version_dir / self.MANIFEST_FILE_NAME).read_bytes()
+            )
+        except (OSError, ValueError):
+            return False
+        if vectors.ndim != 2 or len(ids) != len(vectors):
+            return False
+
+        self._arrays = ids, vectors
+        self.version = version
+        self.source_version = manifest.get("source_version")
+        return True
+
+    def reload_if_changed(self) -> None:
+        """
+        Picks up a version published by another process, costs one readlink when
+        nothing changed.
+        """
+        if self.current_version != self.version:
+            self.load()
+
+    def acquire_build_lock(self) -> int:
+        """
+        Blocks until no other process sharing the index directory is building it.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        lock_fd = os.open(self.directory / self.LOCK_FILE_NAME, os.O_CREAT | os.O_RDWR)
+        fcntl.flock(lock_fd, fcntl.LOCK_EX)
+        return lock_fd
+
+    def release_build_lock(self, lock_fd: int) -> None:
+        fcntl.flock(lock_fd, fcntl.LOCK_UN)
+        os.close(lock_fd)
+
+    def build(
+        self,
+        ids: Sequence[int],
+        vectors: Sequence[Sequence[float]],
+        source_version: str | None = None,
+    ) -> None:
+        versions_dir = self.directory / self.VERSIONS_DIR_NAME
+        versions_dir.mkdir(parents=True, exist_ok=True)
+        id_array = np.asarray(ids, dtype=np.int64)
+        matrix = np.asarray(vectors, dtype=np.float32)
+        matrix = self.normalize(
+            matrix.reshape(len(ids), matrix.shape[-1] if ids else 0)
+        )
+
+        version_dir = Path(tempfile.mkdtemp(prefix="v-", dir=versions_dir))
+        np.save(version_dir / self.VECTORS_FILE_NAME, matrix)
+        np.save(version_dir / self.IDS_FILE_NAME, id_array)
+        (version_dir / self.MANIFEST_FILE_NAME).write_bytes(
+            orjson.dumps({"source_version": source_version, "size": len(id_array)})
+        )
+
+        tmp_link = self.directory / f"{self.CURRENT_LINK_NAME}.{uuid4().hex}"
+        os.symlink(version_dir.relative_to(self.directory), tmp_link)
+        os.replace(tmp_link, self.directory / self.CURRENT_LINK_NAME)
+
+        self.load()
+        self._remove_old_versions()
+
+    def _remove_old_versions(self) -> None:
+        # Mapped files stay readable after being unlinked, so processes still on
+        # an old version aren't affected
+        current_version = self.current_version
+        version_dirs = sorted(
+            (self.directory / self.VERSIONS_DIR_NAME).iterdir(),
+            key=lambda path: path.stat().st_mtime,
+            reverse=True,
+        )
+        for version_dir in version_dirs[self.kept_versions :]:
+            if str(version_dir.relative_to(self.directory)) != current_version:
+                shutil.rmtree(version_dir, ignore_errors=True)
+
+    def search(
+        self, query: Sequence[float], k: int, exclude_ids: Iterable[int] = ()
+    ) -> list[int]:
+        arrays = self._arrays
+        if arrays is None or not len(arrays[0]) or k <= 0:
+            return []
+
+        ids, vectors = arrays
+        scores = vectors @ self.normalize(np.asarray(query, dtype=np.float32))
+        excluded = np.isin(ids, np.fromiter(exclude_ids, dtype=np.int64))
+        scores[excluded] = -np.inf
+
+        k = min(k, int(len(ids) - excluded.sum()))
+        if k <= 0:
+            return []
+
+        top_k = np.argpartition(-scores, k - 1)[:k]
+        top_k = top_k[np.argsort(-scores[top_k])]
+        return ids[top_k].tolist()
+
+    @staticmethod
+    def normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+
+vector_index = VectorIndex(
+    directory=settings.RECOMMENDATION_INDEX_DIR,
+    kept_versions=settings.RECOMMENDATION_INDEX_KEPT_VERSIONS,
+)
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+
+from src.recommendation.client import recommendation_client
+from src.recommendation.config import settings
+from src.recommendation.index import vector_index
+from src.recommendation.repository import RecommendationRepo
+from src.recommendation.service import RecommendationService
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingIngestionPipeline:
+    """
+    Embeds product images in the background. Submitted products are grouped into
+    batches so the model receives many images per call. The vector index is
+    rebuilt at most once per `rebuild_delay`, however many batches were embedded
+    meanwhile, and skipped when another process already rebuilt it from the same
+    embeddings.
+
+    The queue is bounded: producers wait up to `enqueue_timeout` for room and the
+    product is skipped afterwards. Product updates drop the stale embedding before
+    submitting, so skipped products are still embedded on demand the first time
+    they are part of a recommendation.
+    """
+
+    def __init__(
+        self,
+        service: RecommendationService,
+        maxsize: int,
+        enqueue_timeout: float,
+        batch_size: int,
+        batch_max_wait: float,
+        max_retries: int,
+        retry_backoff: float,
+        rebuild_delay: float,
+    ):
+        self.service = service
+        self.enqueue_timeout = enqueue_timeout
+        self.batch_size = batch_size
+        self.batch_max_wait = batch_max_wait
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.rebuild_delay = rebuild_delay
+        self._queue: asyncio.Queue[tuple[int, list[str]]] = asyncio.Queue(
+            maxsize=maxsize
+        )
+        self._task: asyncio.Task | None = None
+        self._rebuild_task: asyncio.Task | None = None
+        self._rebuild_pending = False
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._work())
+
+    async def stop(self) -> None:
+        tasks = [task for task in (self._task, self._rebuild_task) if task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = self._rebuild_task = None
+
+    async def submit(self, product_id: int, image_urls: list[str]) -> bool:
+        try:
+            await asyncio.wait_for(
+                self._queue.put((product_id, image_urls)),
+                timeout=self.enqueue_timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Embedding queue is full, skipped product %s", product_id)
+            return False
+
+        return True
+
+    async def _next_batch(self) -> tuple[dict[int, list[str]], int]:
+        """
+        Returns the batch and how many queue items it was built from, a product
+        queued more than once takes several items but only one batch entry.
+        """
+        product_id, image_urls = await self._queue.get()
+        batch = {product_id: image_urls}
+        total_images = len(image_urls)
+        taken_items = 1
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_max_wait
+        while total_images < self.batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                product_id, image_urls = await asyncio.wait_for(
+                    self._queue.get(), timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                break
+            # The latest images of a product replace the ones queued before
+            batch[product_id] = image_urls
+            total_images += len(image_urls)
+            taken_items += 1
+
+        return batch, taken_items
+
+    async def _work(self) -> None:
+        while True:
+            batch, taken_items = await self._next_batch()
+            try:
+                await self._ingest(batch)
+            finally:
+                for _ in range(taken_items):
+                    self._queue.task_done()
+
+    async def _ingest(self, batch: dict[int, list[str]]) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self.service.embed_products(batch)
+                self._schedule_rebuild()
+                return
+            except Exception:
+                if attempt == self.max_retries:
+                    logger.exception(
+                        "Failed to embed products %s, giving up", list(batch)
+                    )
+                    return
+                await asyncio.sleep(self.retry_backoff * 2**attempt)
+
+    def _schedule_rebuild(self) -> None:
+        self._rebuild_pending = True
+        if self._rebuild_task is None or self._rebuild_task.done():
+            self._rebuild_task = asyncio.create_task(self._rebuild())
+
+    async def _rebuild(self) -> None:
+        # Batches embedded while a rebuild runs are picked up by the next round
+        while self._rebuild_pending:
+            await asyncio.sleep(self.rebuild_delay)
+            self._rebuild_pending = False
+            try:
+                await self.service.refresh_index(if_stale=True)
+            except Exception:
+                logger.exception("Failed to rebuild the vector index")
+
+
+embedding_pipeline = EmbeddingIngestionPipeline(
+    service=RecommendationService(
+        recommendation_repo=RecommendationRepo(),
+        recommendation_client=recommendation_client,
+        vector_index=vector_index,
+    ),
+    maxsize=settings.EMBEDDING_INGESTION_QUEUE_MAXSIZE,
+    enqueue_timeout=settings.EMBEDDING_INGESTION_ENQUEUE_TIMEOUT_SECONDS,
+    batch_size=settings.EMBEDDING_INGESTION_BATCH_SIZE,
+    batch_max_wait=settings.EMBEDDING_INGESTION_BATCH_MAX_WAIT_SECONDS,
+    max_retries=settings.EMBEDDING_INGESTION_MAX_RETRIES,
+    retry_backoff=settings.EMBEDDING_INGESTION_RETRY_BACKOFF_SECONDS,
+    rebuild_delay=settings.EMBEDDING_INGESTION_REBUILD_DELAY_SECONDS,
+)
@@ -0,0 +1,306 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Awaitable, Callable
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException
+
+from src.cache import TTLCache
+from src.product.schemas import ProductDatas
+from src.recommendation.config import settings
+from src.recommendation.constants import JobBackendType, JobStatus
+from src.recommendation.exceptions import RecommendationJobQueueFull
+from src.recommendation.repository import RecommendationRepo
+from src.recommendation.schemas import RecommendationJob, RecommendationJobPayload
+from src.utils import utc_now
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[RecommendationJobPayload], Awaitable[ProductDatas]]
+
+
+class JobBackend(ABC):
+    """
+    Holds pending jobs together with their status and results. A job may be
+    submitted, run and polled by different processes, so anything but a single
+    worker setup needs a backend shared between them.
+    """
+
+    @abstractmethod
+    async def put(self, payload: RecommendationJobPayload) -> RecommendationJob:
+        """
+        Returns the pending job with the same payload if there is one.
+        Raises RecommendationJobQueueFull when the job can't be accepted.
+        """
+
+    @abstractmethod
+    async def claim(self) -> tuple[UUID, RecommendationJobPayload] | None:
+        """
+        Marks the next pending job as running, returns None if there is none.
+        """
+
+    @abstractmethod
+    async def finish(
+        self,
+        job_id: UUID,
+        status: JobStatus,
+        result: ProductDatas | None = None,
+        error: str | None = None,
+    ) -> None:
+        ...
+
+    @abstractmethod
+    async def get(self, job_id: UUID, owner_id: UUID) -> RecommendationJob | None:
+        ...
+
+    async def purge_expired(self) -> None:
+        ...
+
+
+class InMemoryJobBackend(JobBackend):
+    """
+    Keeps jobs in the current process, only usable with a single worker.
+    """
+
+    def __init__(self, maxsize: int, job_ttl: float):
+        self.maxsize = maxsize
+        self._jobs: TTLCache[UUID, RecommendationJob] = TTLCache(
+            maxsize=maxsize * 2, ttl=job_ttl
+        )
+        self._pending: OrderedDict[UUID, RecommendationJobPayload] = OrderedDict()
+
+    async def put(self, payload: RecommendationJobPayload) -> RecommendationJob:
+        for job_id, pending_payload in self._pending.items():
+            job = self._jobs.get(job_id)
+            if job and pending_payload == payload:
+                return job
+
+        if len(self._pending) >= self.maxsize:
+            raise RecommendationJobQueueFull()
+
+        job = RecommendationJob(
+            id=uuid4(),
+            owner_id=payload.owner_id,
+            status=JobStatus.PENDING,
+            created_at=utc_now(),
+        )
+        self._jobs.set(job.id, job)
+        self._pending[job.id] = payload
+        return job
+
+    async def claim(self) -> tuple[UUID, RecommendationJobPayload] | None:
+        while self._pending:
+            job_id, payload = self._pending.popitem(last=False)
+            job = self._jobs.get(job_id)
+            if job:
+                job.status = JobStatus.RUNNING
+                return job_id, payload
+        return None
+
+    async def finish(
+        self,
+        job_id: UUID,
+        status: JobStatus,
+        result: ProductDatas | None = None,
+        error: str | None = None,
+    ) -> None:
+        job = self._jobs.get(job_id)
+        if job:
+            job.status = status
+            job.result = result
+            job.error = error
+            job.finished_at = utc_now()
+
+    async def get(self, job_id: UUID, owner_id: UUID) -> RecommendationJob | None:
+        job = self._jobs.get(job_id)
+        if not job or job.owner_id != owner_id:
+            return None
+        return job.copy()
+
+
+class DatabaseJobBackend(JobBackend):
+    """
+    Keeps jobs in the recommendation_job table. Workers of every process claim
+    them with SKIP LOCKED, and any process can answer polls for any job.
+    """
+
+    def __init__(
+        self,
+        recommendation_repo: RecommendationRepo,
+        maxsize: int,
+        job_ttl: float,
+        job_timeout: float,
+    ):
+        self.recommendation_repo = recommendation_repo
+        self.maxsize = maxsize
+        self.job_ttl = job_ttl
+        self.job_timeout = job_timeout
+
+    async def put(self, payload: RecommendationJobPayload) -> RecommendationJob:
+        job = await self.recommendation_repo.create_job(
+            payload=payload, max_pending=self.maxsize
+        )
+        if not job:
+            raise RecommendationJobQueueFull()
+        return job
+
+    async def claim(self) -> tuple[UUID, RecommendationJobPayload] | None:
+        return await self.recommendation_repo.claim_job(timeout=self.job_timeout)
+
+    async def finish(
+        self,
+        job_id: UUID,
+        status: JobStatus,
+        result: ProductDatas | None = None,
+        error: str | None = None,
+    ) -> None:
+        await self.recommendation_repo.finish_job(
+            job_id=job_id, status=status, result=result, error=error
+        )
+
+    async def get(self, job_id: UUID, owner_id: UUID) -> RecommendationJob | None:
+        return await self.recommendation_repo.get_job(
+            job_id=job_id, owner_id=owner_id, ttl=self.job_ttl
+        )
+
+    async def purge_expired(self) -> None:
+        await self.recommendation_repo.delete_expired_jobs(ttl=self.job_ttl)
+
+
+class RecommendationJobRunner:
+    """
+    Runs recommendation jobs on a pool of asyncio workers so web requests don't
+    wait on model inference. Idle workers poll the backend for jobs submitted by
+    other processes and are woken up right away for jobs submitted by this one.
+    """
+
+    def __init__(
+        self,
+        backend: JobBackend,
+        workers: int,
+        job_ttl: float,
+        poll_interval: float,
+        wait_poll_interval: float,
+    ):
+        self.backend = backend
+        self.workers = workers
+        self.job_ttl = job_ttl
+        self.poll_interval = poll_interval
+        self.wait_poll_interval = wait_poll_interval
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self._handler: JobHandler | None = None
+
+    async def start(self, handler: JobHandler) -> None:
+        if self._tasks:
+            return
+
+        self._handler = handler
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._purge()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, payload: RecommendationJobPayload) -> RecommendationJob:
+        job = await self.backend.put(payload)
+        self._wakeup.set()
+        return job
+
+    async def get(
+        self, job_id: UUID, owner_id: UUID, wait: float = 0
+    ) -> RecommendationJob | None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + wait
+        while True:
+            job = await self.backend.get(job_id=job_id, owner_id=owner_id)
+            if not job or job.status in (JobStatus.SUCCEEDED, JobStatus.FAILED):
+                return job
+
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                return job
+            await asyncio.sleep(min(self.wait_poll_interval, timeout))
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                claimed_job = await self.backend.claim()
+            except Exception:
+                logger.exception("Failed to claim a recommendation job")
+                claimed_job = None
+
+            if not claimed_job:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), timeout=self.poll_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._run(*claimed_job)
+
+    async def _run(self, job_id: UUID, payload: RecommendationJobPayload) -> None:
+        if not self._handler:
+            return
+
+        result, error = None, None
+        try:
+            result = await self._handler(payload)
+        except HTTPException as exc:
+            error = str(exc.detail)
+        except Exception:
+            logger.exception("Recommendation job %s failed", job_id)
+            error = "Unexpected error while computing recommendations!"
+
+        # A job whose status can't be stored stays RUNNING and is reclaimed once
+        # it times out, the worker itself must keep going
+        try:
+            await self.backend.finish(
+                job_id,
+                JobStatus.FAILED if error else JobStatus.SUCCEEDED,
+                result=result,
+                error=error,
+            )
+        except Exception:
+            logger.exception("Failed to finish recommendation job %s", job_id)
+
+    async def _purge(self) -> None:
+        while True:
+            await asyncio.sleep(self.job_ttl)
+            try:
+                await self.backend.purge_expired()
+            except Exception:
+                logger.exception("Failed to purge expired recommendation jobs")
+
+
+def get_job_backend(
+    backend_type: JobBackendType = settings.RECOMMENDATION_JOB_BACKEND,
+) -> JobBackend:
+    if backend_type == JobBackendType.MEMORY:
+        return InMemoryJobBackend(
+            maxsize=settings.RECOMMENDATION_JOB_QUEUE_MAXSIZE,
+            job_ttl=settings.RECOMMENDATION_JOB_TTL_SECONDS,
+        )
+    return DatabaseJobBackend(
+        recommendation_repo=RecommendationRepo(),
+        maxsize=settings.RECOMMENDATION_JOB_QUEUE_MAXSIZE,
+        job_ttl=settings.RECOMMENDATION_JOB_TTL_SECONDS,
+        job_timeout=settings.RECOMMENDATION_JOB_TIMEOUT_SECONDS,
+    )
+
+
+recommendation_jobs = RecommendationJobRunner(
+    backend=get_job_backend(),
+    workers=settings.RECOMMENDATION_JOB_WORKERS,
+    job_ttl=settings.RECOMMENDATION_JOB_TTL_SECONDS,
+    poll_interval=settings.RECOMMENDATION_JOB_POLL_INTERVAL_SECONDS,
+    wait_poll_interval=settings.RECOMMENDATION_JOB_WAIT_POLL_INTERVAL_SECONDS,
+)
@@ -0,0 +1,260 @@
+from datetime import timedelta
+from typing import Any, Mapping
+from uuid import UUID
+
+import orjson
+from sqlalchemy import and_, exists, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import insert
+
+from src.database import database
+from src.product.schemas import ProductDatas
+from src.product.table import product_embedding_tb, product_tb
+from src.recommendation.constants import JobStatus
+from src.recommendation.schemas import RecommendationJob, RecommendationJobPayload
+from src.recommendation.table import image_embedding_tb, recommendation_job_tb
+
+
+class RecommendationRepo:
+    async def get_product_embeddings(
+        self, product_ids: list[int]
+    ) -> dict[int, list[float]]:
+        if not product_ids:
+            return {}
+
+        select_query = select(
+            product_embedding_tb.c.product_id, product_embedding_tb.c.embedding
+        ).where(product_embedding_tb.c.product_id.in_(product_ids))
+        results = await database.fetch_all(select_query)
+        return {
+            result._mapping["product_id"]: result._mapping["embedding"]
+            for result in results
+        }
+
+    async def get_public_product_embeddings(
+        self,
+    ) -> tuple[list[int], list[list[float]]]:
+        select_query = (
+            select(product_embedding_tb.c.product_id, product_embedding_tb.c.embedding)
+            .join(
+                product_tb,
+                onclause=product_tb.c.id == product_embedding_tb.c.product_id,
+            )
+            .where(product_tb.c.is_public)
+            .order_by(product_embedding_tb.c.product_id)
+        )
+        results = await database.fetch_all(select_query)
+        return (
+            [result._mapping["product_id"] for result in results],
+            [result._mapping["embedding"] for result in results],
+        )
+
+    async def get_public_product_embeddings_version(self) -> str:
+        """
+        Changes whenever the result of get_public_product_embeddings does.
+        """
+        select_query = select(
+            func.count(),
+            func.max(
+                func.greatest(
+                    product_embedding_tb.c.updated_at, product_tb.c.updated_at
+                )
+            ),
+        ).select_from(
+            product_embedding_tb.join(
+                product_tb,
+                onclause=and_(
+                    product_tb.c.id == product_embedding_tb.c.product_id,
+                    product_tb.c.is_public,
+                ),
+            )
+        )
+        result = await database.fetch_one(select_query)
+        count, last_modified = result  # type: ignore
+        return f"{count}:{last_modified.isoformat() if last_modified else ''}"
+
+    async def upsert_product_embeddings(
+        self, embeddings: dict[int, list[float]]
+    ) -> None:
+        if not embeddings:
+            return
+
+        insert_query = insert(product_embedding_tb).values(
+            [
+                {"product_id": product_id, "embedding": embedding}
+                for product_id, embedding in embeddings.items()
+            ]
+        )
+        upsert_query = insert_query.on_conflict_do_update(
+            index_elements=[product_embedding_tb.c.product_id],
+            set_={
+                "embedding": insert_query.excluded.embedding,
+                "updated_at": func.now(),
+            },
+        )
+        await database.execute(upsert_query)
+
+    async def get_image_embeddings(
+        self, image_urls: list[str]
+    ) -> dict[str, list[float]]:
+        if not image_urls:
+            return {}
+
+        select_query = select(
+            image_embedding_tb.c.image_url, image_embedding_tb.c.embedding
+        ).where(image_embedding_tb.c.image_url.in_(image_urls))
+        results = await database.fetch_all(select_query)
+        return {
+            result._mapping["image_url"]: result._mapping["embedding"]
+            for result in results
+        }
+
+    async def upsert_image_embeddings(self, embeddings: dict[str, list[float]]) -> None:
+        if not embeddings:
+            return
+
+        insert_query = insert(image_embedding_tb).values(
+            [
+                {"image_url": image_url, "embedding": embedding}
+                for image_url, embedding in embeddings.items()
+            ]
+        )
+        upsert_query = insert_query.on_conflict_do_update(
+            index_elements=[image_embedding_tb.c.image_url],
+            set_={
+                "embedding": insert_query.excluded.embedding,
+                "updated_at": func.now(),
+            },
+        )
+        await database.execute(upsert_query)
+
+    async def create_job(
+        self, payload: RecommendationJobPayload, max_pending: int
+    ) -> RecommendationJob | None:
+        """
+        Returns the pending job with the same payload if there is one, so repeated
+        submissions are coalesced. Returns None when `max_pending` jobs are queued.
+        """
+        payload_data = orjson.loads(payload.json())
+        existing_cte = (
+            recommendation_job_tb.select()
+            .where(
+                recommendation_job_tb.c.owner_id == payload.owner_id,
+                recommendation_job_tb.c.status == JobStatus.PENDING,
+                recommendation_job_tb.c.payload == payload_data,
+            )
+            .limit(1)
+            .cte("existing")
+        )
+        pending_jobs = (
+            select(func.count())
+            .where(recommendation_job_tb.c.status == JobStatus.PENDING)
+            .scalar_subquery()
+        )
+        inserted_cte = (
+            insert(recommendation_job_tb)
+            .from_select(
+                ["owner_id", "payload", "status"],
+                select(
+                    literal(payload.owner_id, type_=PG_UUID(as_uuid=True)),
+                    literal(payload_data, type_=JSONB),
+                    literal(JobStatus.PENDING.value),
+                ).where(~exists(existing_cte.select()), pending_jobs < max_pending),
+            )
+            .returning(*recommendation_job_tb.c)
+            .cte("inserted")
+        )
+        select_query = inserted_cte.select().union_all(existing_cte.select())
+        result = await database.fetch_one(select_query)
+        return _to_job(result._mapping) if result else None
+
+    async def claim_job(
+        self, timeout: float
+    ) -> tuple[UUID, RecommendationJobPayload] | None:
+        """
+        Marks the oldest pending job as running and returns it. Jobs left running
+        for longer than `timeout`, e.g. by a worker that died, are claimed again.
+        """
+        next_job_id = (
+            select(recommendation_job_tb.c.id)
+            .where(
+                or_(
+                    recommendation_job_tb.c.status == JobStatus.PENDING,
+                    and_(
+                        recommendation_job_tb.c.status == JobStatus.RUNNING,
+                        recommendation_job_tb.c.started_at
+                        < func.now() - timedelta(seconds=timeout),
+                    ),
+                )
+            )
+            .order_by(recommendation_job_tb.c.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        update_query = (
+            recommendation_job_tb.update()
+            .where(recommendation_job_tb.c.id == next_job_id)
+            .values(status=JobStatus.RUNNING, started_at=func.now())
+            .returning(recommendation_job_tb.c.id, recommendation_job_tb.c.payload)
+        )
+        result = await database.fetch_one(update_query)
+        if not result:
+            return None
+
+        payload = _load_json(result._mapping["payload"])
+        return result._mapping["id"], RecommendationJobPayload(**payload)
+
+    async def finish_job(
+        self,
+        job_id: UUID,
+        status: JobStatus,
+        result: ProductDatas | None = None,
+        error: str | None = None,
+    ) -> None:
+        update_query = (
+            recommendation_job_tb.update()
+            .where(recommendation_job_tb.c.id == job_id)
+            .values(
+                status=status,
+                result=orjson.loads(result.json()) if result else None,
+                error=error,
+                finished_at=func.now(),
+            )
+        )
+        await database.execute(update_query)
+
+    async def get_job(
+        self, job_id: UUID, owner_id: UUID, ttl: float
+    ) -> RecommendationJob | None:
+        select_query = recommendation_job_tb.select().where(
+            recommendation_job_tb.c.id == job_id,
+            recommendation_job_tb.c.owner_id == owner_id,
+            recommendation_job_tb.c.created_at >= func.now() - timedelta(seconds=ttl),
+        )
+        result = await database.fetch_one(select_query)
+        return _to_job(result._mapping) if result else None
+
+    async def delete_expired_jobs(self, ttl: float) -> None:
+        delete_query = recommendation_job_tb.delete().where(
+            recommendation_job_tb.c.created_at < func.now() - timedelta(seconds=ttl)
+        )
+        await database.execute(delete_query)
+
+
+def _load_json(value: Any) -> Any:
+    return orjson.loads(value) if isinstance(value, (str, bytes)) else value
+
+
+def _to_job(mapping: Mapping[str, Any]) -> RecommendationJob:
+    result = _load_json(mapping["result"])
+    return RecommendationJob(
+        id=mapping["id"],
+        owner_id=mapping["owner_id"],
+        status=mapping["status"],
+        created_at=mapping["created_at"],
+        finished_at=mapping["finished_at"],
+        result=ProductDatas(**result) if result else None,
+        error=mapping["error"],
+    )
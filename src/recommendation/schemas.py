@@ -0,0 +1,38 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import Field
+
+from src.product.schemas import ProductDatas
+from src.recommendation.constants import CircuitState, JobStatus
+from src.schemas import BaseModel
+
+
+class RecommendationJobPayload(BaseModel):
+    owner_id: UUID
+    include_public_products: bool = False
+    size: int = 20
+    offset: int = 0
+
+
+class RecommendationJob(BaseModel):
+    id: UUID
+    owner_id: UUID | None = Field(default=None, hidden=True, exclude=True)
+    status: JobStatus = JobStatus.PENDING
+    created_at: datetime
+    finished_at: datetime | None
+    result: ProductDatas | None
+    error: str | None
+
+
+class CircuitBreakerMetrics(BaseModel):
+    name: str
+    state: CircuitState
+    consecutive_failures: int
+    total_calls: int
+    total_failures: int
+    total_rejections: int
+    opened_at: datetime | None
+    latency_p50_ms: float | None
+    latency_p95_ms: float | None
+    latency_max_ms: float | None
@@ -0,0 +1,148 @@
+import logging
+
+import numpy as np
+from starlette.concurrency import run_in_threadpool
+
+from src.product.schemas import ProductData
+from src.recommendation.client import RecommendationClient, recommendation_client
+from src.recommendation.exceptions import RecommendationServiceInvalidResponse
+from src.recommendation.index import VectorIndex, vector_index
+from src.recommendation.repository import RecommendationRepo
+
+logger = logging.getLogger(__name__)
+
+
+class RecommendationService:
+    def __init__(
+        self,
+        recommendation_repo: RecommendationRepo,
+        recommendation_client: RecommendationClient,
+        vector_index: VectorIndex,
+    ):
+        self.recommendation_repo = recommendation_repo
+        self.recommendation_client = recommendation_client
+        self.vector_index = vector_index
+
+    async def get_recommended_product_ids(
+        self, referenced_products: list[ProductData], size: int
+    ) -> list[int]:
+        # The readlink is cheap enough for the event loop, mapping a new version is not
+        if self.vector_index.current_version != self.vector_index.version:
+            await run_in_threadpool(self.vector_index.load)
+        if self.vector_index.is_ready:
+            embeddings = await self.get_product_embeddings(referenced_products)
+            dimensions = {len(embedding) for embedding in embeddings.values()}
+            if embeddings and dimensions == {self.vector_index.dimension}:
+                closet_embedding = np.mean(list(embeddings.values()), axis=0)
+                return await run_in_threadpool(
+                    self.vector_index.search,
+                    closet_embedding,
+                    k=size,
+                    exclude_ids=[product.id for product in referenced_products],
+                )
+
+        image_urls = []
+        for product in referenced_products:
+            image_urls.extend(product.image_urls)
+        return await self.recommendation_client.get_recommended_product_ids(
+            image_urls=image_urls, size=size
+        )
+
+    async def get_product_embeddings(
+        self, products: list[ProductData]
+    ) -> dict[int, list[float]]:
+        """
+        Returns the stored embedding of each product, embedding the images of those
+        that don't have one yet.
+        """
+        embeddings = await self.recommendation_repo.get_product_embeddings(
+            [product.id for product in products]
+        )
+        new_embeddings = await self.embed_products(
+            {
+                product.id: product.image_urls
+                for product in products
+                if product.id not in embeddings and product.image_urls
+            }
+        )
+        return {**embeddings, **new_embeddings}
+
+    async def embed_products(
+        self, product_image_urls: dict[int, list[str]]
+    ) -> dict[int, list[float]]:
+        """
+        Stores the mean of its image embeddings as each product's embedding.
+        """
+        image_embeddings = await self.embed_images(
+            [url for image_urls in product_image_urls.values() for url in image_urls]
+        )
+        product_embeddings = {
+            product_id: np.mean(
+                [image_embeddings[url] for url in image_urls], axis=0
+            ).tolist()
+            for product_id, image_urls in product_image_urls.items()
+            if image_urls
+        }
+        await self.recommendation_repo.upsert_product_embeddings(product_embeddings)
+        return product_embeddings
+
+    async def embed_images(self, image_urls: list[str]) -> dict[str, list[float]]:
+        """
+        Only images which have never been embedded before are sent to the model.
+        """
+        image_urls = list(dict.fromkeys(image_urls))
+        embeddings = await self.recommendation_repo.get_image_embeddings(image_urls)
+        missing_image_urls = [url for url in image_urls if url not in embeddings]
+        if not missing_image_urls:
+            return embeddings
+
+        image_embeddings = await self.recommendation_client.get_image_embeddings(
+            image_urls=missing_image_urls
+        )
+        # Embeddings are matched to images by position, a short response can't be
+        # attributed to any of them
+        if len(image_embeddings) != len(missing_image_urls):
+            logger.warning(
+                "Got %s embeddings for %s images: %s",
+                len(image_embeddings),
+                len(missing_image_urls),
+                missing_image_urls,
+            )
+            raise RecommendationServiceInvalidResponse()
+
+        new_embeddings = dict(zip(missing_image_urls, image_embeddings))
+        await self.recommendation_repo.upsert_image_embeddings(new_embeddings)
+        return {**embeddings, **new_embeddings}
+
+    async def refresh_index(self, if_stale: bool = False) -> None:
+        """
+        Rebuilds the index from the stored embeddings. With `if_stale`, the
+        published index is reused when it was built from the current embeddings.
+        """
+        lock_fd = await run_in_threadpool(self.vector_index.acquire_build_lock)
+        try:
+            repo = self.recommendation_repo
+            source_version = await repo.get_public_product_embeddings_version()
+            if if_stale:
+                await run_in_threadpool(self.vector_index.reload_if_changed)
+                if (
+                    self.vector_index.version
+                    and self.vector_index.source_version == source_version
+                ):
+                    return
+
+            ids, vectors = await repo.get_public_product_embeddings()
+            await run_in_threadpool(
+                self.vector_index.build, ids, vectors, source_version
+            )
+        finally:
+            self.vector_index.release_build_lock(lock_fd)
+
+
+async def load_vector_index() -> None:
+    service = RecommendationService(
+        recommendation_repo=RecommendationRepo(),
+        recommendation_client=recommendation_client,
+        vector_index=vector_index,
+    )
+    await service.refresh_index(if_stale=True)
@@ -0,0 +1,40 @@
+"""
+Stand-in for the AI model service, for local development and tests.
+Embeddings are derived from a hash of the image URL so they are deterministic.
+Run it and point AI_MODEL_URL to http://localhost:8001:
+
+    uvicorn src.recommendation.stub_server:app --port 8001
+"""
+import hashlib
+
+import numpy as np
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+EMBEDDING_DIMENSION = 128
+
+app = FastAPI(title="DressUp model stub")
+
+
+class EmbeddingsRequest(BaseModel):
+    image_urls: list[str]
+
+
+class RecommendationRequest(BaseModel):
+    image_urls: list[str]
+    num_of_recommended_products: int
+
+
+def embed_image(image_url: str) -> list[float]:
+    seed = int.from_bytes(hashlib.sha256(image_url.encode()).digest()[:8], "big")
+    return np.random.default_rng(seed).normal(size=EMBEDDING_DIMENSION).tolist()
+
+
+@app.post("/embeddings")
+async def get_embeddings(request: EmbeddingsRequest) -> list[list[float]]:
+    return [embed_image(image_url) for image_url in request.image_urls]
+
+
+@app.post("/recommendation")
+async def get_recommendation(request: RecommendationRequest) -> list[int]:
+    return list(range(1, request.num_of_recommended_products + 1))
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String, Table, func, text
+from sqlalchemy.dialects import postgresql
+
+from src.database import metadata
+
+image_embedding_tb = Table(
+    "image_embedding",
+    metadata,
+    Column("image_url", String, primary_key=True),
+    Column("embedding", postgresql.ARRAY(postgresql.REAL), nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column(
+        "updated_at",
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    ),
+)
+
+recommendation_job_tb = Table(
+    "recommendation_job",
+    metadata,
+    Column(
+        "id",
+        postgresql.UUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("uuid_generate_v4()"),
+    ),
+    Column("owner_id", ForeignKey("user.id", ondelete="CASCADE"), nullable=False),
+    Column("payload", postgresql.JSONB, nullable=False),
+    Column("status", String, nullable=False),
+    Column("result", postgresql.JSONB(none_as_null=True)),
+    Column("error", String),
+    Column(
+        "created_at", DateTime(timezone=True), server_default=func.now(), nullable=False
+    ),
+    Column("started_at", DateTime(timezone=True)),
+    Column("finished_at", DateTime(timezone=True)),
+    Index("recommendation_job_status_created_at_idx", "status", "created_at"),
+)
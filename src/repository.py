@@ -0,0 +1,76 @@
+import copy
+import functools
+import inspect
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+T = TypeVar("T")
+
+_identity_map: ContextVar[dict[Hashable, Any] | None] = ContextVar(
+    "identity_map", default=None
+)
+
+
+def memoized(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """
+    Reuses the result of an identical repository lookup made earlier in the same
+    request. Outside of a request the lookup always hits the database. Only meant
+    for reads: every caller gets its own copy, so modifying it doesn't leak into
+    later lookups.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs) -> T:
+        identity_map = _identity_map.get()
+        if identity_map is None:
+            return await func(self, *args, **kwargs)
+
+        # Positional and keyword arguments map onto the same key
+        arguments = signature.bind(self, *args, **kwargs).arguments
+        key = (func.__qualname__, *list(arguments.items())[1:])
+        try:
+            hash(key)
+        except TypeError:
+            return await func(self, *args, **kwargs)
+
+        if key not in identity_map:
+            identity_map[key] = await func(self, *args, **kwargs)
+        return copy.deepcopy(identity_map[key])
+
+    return wrapper
+
+
+def invalidates(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """
+    Forgets every lookup memoized in the current request once a write has run.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs) -> T:
+        try:
+            return await func(self, *args, **kwargs)
+        finally:
+            identity_map = _identity_map.get()
+            if identity_map is not None:
+                identity_map.clear()
+
+    return wrapper
+
+
+class IdentityMapMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _identity_map.set({})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _identity_map.reset(token)
@@ -0,0 +1,60 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response, status
+
+
+def make_etag(content: bytes, weak: bool = False) -> str:
+    digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+
+def get_validator_headers(
+    etag: str, last_modified: datetime | None = None
+) -> dict[str, str]:
+    # Clients may store the response but have to revalidate it before reuse
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(
+            last_modified.astimezone(timezone.utc), usegmt=True
+        )
+    return headers
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: datetime | None = None
+) -> bool:
+    """
+    Evaluates the request's If-None-Match / If-Modified-Since headers against the
+    current validators. If-None-Match takes precedence as per RFC 9110.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # Weak comparison: W/"x" and "x" are considered the same representation
+        candidate_etags = {
+            candidate.strip().removeprefix("W/")
+            for candidate in if_none_match.split(",")
+        }
+        return etag.removeprefix("W/") in candidate_etags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            modified_since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if not modified_since.tzinfo:
+            modified_since = modified_since.replace(tzinfo=timezone.utc)
+        # HTTP dates have a one-second resolution
+        return last_modified.replace(microsecond=0) <= modified_since
+    return False
+
+
+def not_modified_response(etag: str, last_modified: datetime | None = None) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=get_validator_headers(etag=etag, last_modified=last_modified),
+    )
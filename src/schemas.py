@@ -6,6 +6,8 @@ import orjson
 from pydantic import BaseModel as PydanticBaseModel
 from pydantic import root_validator
 
+from src.responses import make_etag
+
 
 def orjson_dumps(v: Any, *, default: Callable[[Any], Any] | None) -> str:
     return orjson.dumps(v, default=default).decode()
@@ -56,3 +58,19 @@ class BaseModel(PydanticBaseModel):
 
 class Message(PydanticBaseModel):
     detail: str
+
+
+class ResourceVersion(PydanticBaseModel):
+    etag: str
+    last_modified: datetime | None
+
+    @classmethod
+    def from_validators(
+        cls, last_modified: datetime | None, *validators: Any
+    ) -> "ResourceVersion":
+        """
+        Builds a weak ETag from cheap-to-read values that change whenever the
+        resource's representation does, e.g. `updated_at` columns and row counts.
+        """
+        content = orjson.dumps([last_modified, *validators], default=str)
+        return cls(etag=make_etag(content, weak=True), last_modified=last_modified)
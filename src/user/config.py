@@ -0,0 +1,9 @@
+from pydantic import BaseSettings
+
+
+class Settings(BaseSettings):
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_CACHE_MAXSIZE: int = 10_000
+
+
+settings = Settings()
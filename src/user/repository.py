@@ -3,7 +3,10 @@ from uuid import UUID
 from sqlalchemy import insert, select
 
 from src.auth import security
+from src.cache import TTLCache
 from src.database import database
+from src.repository import invalidates, memoized
+from src.user.config import settings
 from src.user.schemas import (
     ContactCreate,
     ContactData,
@@ -13,25 +16,46 @@ from src.user.schemas import (
 )
 from src.user.table import contact_tb, user_tb
 
+# User rows are looked up on almost every authenticated request. Every write goes
+# through UserRepo, which keeps this cache up to date.
+_user_cache: TTLCache[UUID, UserData] = TTLCache(
+    maxsize=settings.USER_CACHE_MAXSIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
 
 class UserRepo:
+    @invalidates
     async def create(self, create_data: UserCreate) -> UserData:
         if create_data.password:
             create_data.password = await security.hash_password(create_data.password)  # type: ignore
         insert_query = insert(user_tb).values(create_data.dict()).returning(user_tb)
         result = await database.fetch_one(insert_query)
-        return UserData(**result._mapping)  # type: ignore
+        new_user = UserData(**result._mapping)  # type: ignore
+        _user_cache.set(new_user.id, new_user)
+        return new_user.copy()
 
+    @memoized
     async def get(self, id: UUID) -> UserData | None:
+        user = _user_cache.get(id)
+        if user:
+            return user.copy()
+
         select_query = select(user_tb).where(user_tb.c.id == id)
         result = await database.fetch_one(select_query)
-        return UserData(**result._mapping) if result else None
+        if not result:
+            return None
+
+        user = UserData(**result._mapping)
+        _user_cache.set(user.id, user)
+        return user.copy()
 
+    @memoized
     async def get_by_email(self, email: str) -> UserData | None:
         select_query = select(user_tb).where(user_tb.c.email == email)
         result = await database.fetch_one(select_query)
         return UserData(**result._mapping) if result else None
 
+    @invalidates
     async def update_user(self, id: UUID, update_data: UserUpdate | dict) -> UserData:
         if isinstance(update_data, UserUpdate):
             update_data = update_data.dict(exclude_unset=True, exclude_none=True)
@@ -46,8 +70,11 @@ class UserRepo:
             .returning(user_tb)
         )
         result = await database.fetch_one(update_query)
-        return UserData(**result._mapping)  # type: ignore
+        updated_user = UserData(**result._mapping)  # type: ignore
+        _user_cache.set(updated_user.id, updated_user)
+        return updated_user.copy()
 
+    @invalidates
     async def create_contact(self, create_data: ContactCreate) -> ContactData:
         insert_query = (
             insert(contact_tb).values(create_data.dict()).returning(contact_tb)